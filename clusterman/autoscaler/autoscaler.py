@@ -11,9 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import traceback
+import logging
+from operator import itemgetter
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import MutableMapping
 from typing import Optional
@@ -33,7 +35,10 @@ from clusterman.exceptions import NoSignalConfiguredException
 from clusterman.exceptions import ResourceRequestError
 from clusterman.interfaces.signal import Signal
 from clusterman.kubernetes.kubernetes_cluster_connector import KubernetesClusterConnector
+from clusterman.monitoring_lib import AsyncGauge
+from clusterman.monitoring_lib import GaugeProtocol
 from clusterman.monitoring_lib import get_monitoring_client
+from clusterman.monitoring_lib import SignalFXMonitoringClient
 from clusterman.signals.external_signal import ExternalSignal
 from clusterman.signals.pending_pods_signal import PendingPodsSignal
 from clusterman.util import autoscaling_is_paused
@@ -74,6 +79,7 @@ class Autoscaler:
         self.scheduler = scheduler
         self.apps = apps
         self.monitoring_enabled = monitoring_enabled
+        self.pool_namespace = POOL_NAMESPACE.format(pool=self.pool, scheduler=self.scheduler)
 
         # TODO: handle multiple apps in the autoscaler (CLUSTERMAN-126)
         if len(self.apps) > 1:
@@ -83,17 +89,20 @@ class Autoscaler:
 
         gauge_dimensions = {'cluster': cluster, 'pool': pool}
         monitoring_client = get_monitoring_client()
-        self.target_capacity_gauge = monitoring_client.create_gauge(TARGET_CAPACITY_GAUGE_NAME, gauge_dimensions)
+        # When we're sending metrics to SignalFX, emit gauge values from a background thread so a slow metrics emitter
+        # can't stall the autoscaling loop; the log client (and simulations/dry runs) are cheap enough to emit inline
+        use_async_gauges = monitoring_enabled and monitoring_client is SignalFXMonitoringClient
+
+        def create_gauge(name: str) -> GaugeProtocol:
+            gauge = monitoring_client.create_gauge(name, gauge_dimensions)
+            return AsyncGauge(gauge) if use_async_gauges else gauge
+
+        self.target_capacity_gauge = create_gauge(TARGET_CAPACITY_GAUGE_NAME)
         self.resource_request_gauges: Dict[str, Any] = {}
         for resource in SignalResourceRequest._fields:
-            self.resource_request_gauges[resource] = monitoring_client.create_gauge(
-                RESOURCE_GAUGE_BASE_NAME.format(resource=resource),
-                gauge_dimensions,
-            )
+            self.resource_request_gauges[resource] = create_gauge(RESOURCE_GAUGE_BASE_NAME.format(resource=resource))
 
-        self.autoscaling_config = get_autoscaling_config(
-            POOL_NAMESPACE.format(pool=self.pool, scheduler=self.scheduler),
-        )
+        self.autoscaling_config = get_autoscaling_config(self.pool_namespace)
         self.pool_manager = pool_manager or PoolManager(self.cluster, self.pool, self.scheduler)
 
         self.mesos_region = staticconf.read_string('aws.region')
@@ -122,11 +131,15 @@ class Autoscaler:
                 signal_namespace=staticconf.read_string('autoscaling.default_signal_role'),
             )
         self.signal = self._get_signal_for_app(self.apps[0])
+        self._run_frequency: Optional[int] = None
         logger.info('Initialization complete')
 
     @property
     def run_frequency(self) -> int:
-        return self.signal.period_minutes * 60
+        # The signal (and therefore its period) is fixed once the autoscaler is initialized, so only compute this once
+        if self._run_frequency is None:
+            self._run_frequency = self.signal.period_minutes * 60
+        return self._run_frequency
 
     def run(self, dry_run: bool = False, timestamp: Optional[arrow.Arrow] = None) -> None:
         """ Do a single check to scale the fleet up or down if necessary.
@@ -150,7 +163,7 @@ class Autoscaler:
             logger.error(f'Client signal {self.signal.name} failed; using default signal')
             signal_name = self.default_signal.name
             resource_request = self.default_signal.evaluate(timestamp)
-            exception, tb = e, traceback.format_exc()
+            exception = e
 
         logger.info(f'Signal {signal_name} requested {resource_request}')
 
@@ -177,7 +190,9 @@ class Autoscaler:
         self.pool_manager.modify_target_capacity(new_target_capacity, dry_run=dry_run, no_scale_down=no_scale_down)
 
         if exception:
-            logger.error(f'The client signal failed with:\n{tb}')
+            # exc_info lets the logging module format the traceback itself, so nothing gets rendered unless the
+            # message is actually emitted
+            logger.error('The client signal failed with:', exc_info=exception)
             raise exception
 
     def _emit_requested_resource_metrics(self, resource_request: SignalResourceRequest, dry_run: bool) -> None:
@@ -194,7 +209,11 @@ class Autoscaler:
         logger.info(f'Loading autoscaling signal for {app} on {self.pool} in {self.cluster}')
 
         # TODO (CLUSTERMAN-126, CLUSTERMAN-195) apps will eventually have separate namespaces from pools
-        pool_namespace = POOL_NAMESPACE.format(pool=app, scheduler=self.scheduler)
+        pool_namespace = (
+            self.pool_namespace
+            if app == self.pool
+            else POOL_NAMESPACE.format(pool=app, scheduler=self.scheduler)
+        )
 
         try:
             # see if the pool has set up a custom signal correctly; if not, fall back to the default signal
@@ -253,11 +272,12 @@ class Autoscaler:
         cluster_total_resources = self.pool_manager.cluster_connector.get_cluster_total_resources()
         cluster_allocated_resources = self.pool_manager.cluster_connector.get_cluster_allocated_resources()
         non_orphan_fulfilled_capacity = self.pool_manager.non_orphan_fulfilled_capacity
-        logger.info(f'Currently at target_capacity of {current_target_capacity}')
-        logger.info(f'Currently non-orphan fulfilled capacity is {non_orphan_fulfilled_capacity}')
-        logger.info(f'Current cluster total resources: {cluster_total_resources}')
-        logger.info(f'Current cluster allocated resources: {cluster_allocated_resources}')
-        logger.info(f'Current setpoint: {self.autoscaling_config.setpoint}')
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f'Currently at target_capacity of {current_target_capacity}')
+            logger.info(f'Currently non-orphan fulfilled capacity is {non_orphan_fulfilled_capacity}')
+            logger.info(f'Current cluster total resources: {cluster_total_resources}')
+            logger.info(f'Current cluster allocated resources: {cluster_allocated_resources}')
+            logger.info(f'Current setpoint: {self.autoscaling_config.setpoint}')
         # This block of code is kinda complicated logic for figuring out what happens if the cluster
         # or the resource request is empty.  There are essentially four checks, as follows:
         #
@@ -280,10 +300,13 @@ class Autoscaler:
         # 4. If the resource request and the target capacity are non-zero, but the nodes haven't joined
         #    the cluster yet, we just need to wait until they join before doing anything else.
 
-        if all(requested_quantity is None for requested_quantity in resource_request):
+        requested_quantities = [
+            requested_quantity for requested_quantity in resource_request if requested_quantity is not None
+        ]
+        if not requested_quantities:
             logger.info('No data from signal, not changing capacity')
             return current_target_capacity
-        elif all(requested_quantity in {0, None} for requested_quantity in resource_request):
+        elif not any(requested_quantities):
             return 0
         elif current_target_capacity == 0:
             try:
@@ -315,10 +338,11 @@ class Autoscaler:
             resource_request,
             cluster_total_resources,
         )
-        logger.info(
-            f'Fulfilling resource request will cause {most_constrained_resource} to be the most constrained resource '
-            f'at {usage_pct} usage'
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f'Fulfilling resource request will cause {most_constrained_resource} to be the most constrained '
+                f'resource at {usage_pct} usage'
+            )
 
         # We want to scale the cluster so that requested / (total * scale_factor) = setpoint.
         # We already have requested/total in the form of usage_pct, so we can solve for scale_factor:
@@ -345,24 +369,29 @@ class Autoscaler:
 
         # If the percentage change between current target capacity and the new target capacity is more than the
         # allowable margin we scale up/down to reach the setpoint. We want to use target_capacity here instead of
-        # get_resource_total to protect against short-term fluctuations in the cluster.
-        target_capacity_percentage_change = abs(new_target_capacity - current_target_capacity) / current_target_capacity
-        logger.info(
-            f'Percentage change between current target capacity {current_target_capacity}, and new target capacity '
-            f'{new_target_capacity}, is {target_capacity_percentage_change}'
-        )
+        # get_resource_total to protect against short-term fluctuations in the cluster.  Staying within the margin
+        # is the common case, so check that first (without dividing) and only work out the percentage change for
+        # logging when we're actually going to scale.
         margin = self.autoscaling_config.target_capacity_margin
-        if target_capacity_percentage_change >= margin:
+        if abs(new_target_capacity - current_target_capacity) < margin * current_target_capacity:
             logger.info(
-                f'Percentage change between current and new target capacities is greater than margin ({margin}). '
-                f'Scaling to {new_target_capacity}.'
+                f'New target capacity {new_target_capacity} is within our target capacity margin ({margin}) of '
+                f'{current_target_capacity}. Not changing target capacity.'
+            )
+            return current_target_capacity
+
+        if logger.isEnabledFor(logging.INFO):
+            target_capacity_percentage_change = (
+                abs(new_target_capacity - current_target_capacity) / current_target_capacity
             )
-        else:
             logger.info(
-                f'We are within our target capacity margin ({margin}). Not changing target capacity.'
+                f'Percentage change between current target capacity {current_target_capacity}, and new target '
+                f'capacity {new_target_capacity}, is {target_capacity_percentage_change}'
+            )
+            logger.info(
+                f'Percentage change between current and new target capacities is greater than margin ({margin}). '
+                f'Scaling to {new_target_capacity}.'
             )
-            new_target_capacity = current_target_capacity
-
         return new_target_capacity
 
     def _get_most_constrained_resource_for_request(
@@ -378,26 +407,29 @@ class Autoscaler:
         :returns: a tuple of the most constrained resource name and its utilization percentage if the provided request
             were to be fulfilled
         """
-        requested_resource_usage_pcts = {}
-        for resource, resource_total in cluster_total_resources._asdict().items():
-            resource_request_value = getattr(resource_request, resource)
-            if resource_request_value is None:
-                continue
-
-            if resource in self.autoscaling_config.excluded_resources:
-                logger.info(f'Signal requested {resource_total} {resource} but it is excluded from scaling decisions')
-                continue
-
-            if resource_total == 0:
-                if resource_request_value > 0:
-                    raise ResourceRequestError(
-                        f'Signal requested {resource_request_value} for {resource} '
-                        "but the cluster doesn't have any of that resource"
+        def requested_resource_usage_pcts() -> Iterator[Tuple[str, float]]:
+            for resource, resource_total in zip(cluster_total_resources._fields, cluster_total_resources):
+                resource_request_value = getattr(resource_request, resource)
+                if resource_request_value is None:
+                    continue
+
+                if resource in self.autoscaling_config.excluded_resources:
+                    logger.info(
+                        f'Signal requested {resource_total} {resource} but it is excluded from scaling decisions'
                     )
-                requested_resource_usage_pcts[resource] = 0
-            else:
-                requested_resource_usage_pcts[resource] = resource_request_value / resource_total
-        return max(requested_resource_usage_pcts.items(), key=lambda x: x[1])
+                    continue
+
+                if resource_total == 0:
+                    if resource_request_value > 0:
+                        raise ResourceRequestError(
+                            f'Signal requested {resource_request_value} for {resource} '
+                            "but the cluster doesn't have any of that resource"
+                        )
+                    yield resource, 0
+                else:
+                    yield resource, resource_request_value / resource_total
+
+        return max(requested_resource_usage_pcts(), key=itemgetter(1))
 
     def _get_historical_weighted_resource_value(self) -> ClustermanResources:
         """ Compute the weighted value of each type of resource in the cluster
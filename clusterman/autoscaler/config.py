@@ -17,6 +17,8 @@ from typing import NamedTuple
 import colorlog
 import staticconf
 
+from clusterman.config import get_namespace_reader
+
 logger = colorlog.getLogger(__name__)
 
 
@@ -39,7 +41,7 @@ def get_autoscaling_config(config_namespace: str) -> AutoscalingConfig:
     default_setpoint = staticconf.read_float('autoscaling.setpoint')
     default_target_capacity_margin = staticconf.read_float('autoscaling.target_capacity_margin')
 
-    reader = staticconf.NamespaceReaders(config_namespace)
+    reader = get_namespace_reader(config_namespace)
     return AutoscalingConfig(
         excluded_resources=reader.read_list('autoscaling.excluded_resources', default=default_excluded_resources),
         setpoint=reader.read_float('autoscaling.setpoint', default=default_setpoint),
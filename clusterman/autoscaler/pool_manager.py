@@ -14,6 +14,9 @@
 import math
 import traceback
 from collections import defaultdict
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
 from typing import cast
 from typing import Collection
 from typing import Dict
@@ -26,12 +29,12 @@ from typing import Tuple
 from typing import Type
 
 import colorlog
-import staticconf
 from kubernetes.client.models.v1_pod import V1Pod as KubernetesPod
 
 from clusterman.aws.aws_resource_group import AWSResourceGroup
 from clusterman.aws.markets import InstanceMarket
 from clusterman.aws.util import RESOURCE_GROUPS
+from clusterman.config import get_namespace_reader
 from clusterman.config import POOL_NAMESPACE
 from clusterman.draining.queue import DrainingClient
 from clusterman.exceptions import AllResourceGroupsAreStaleError
@@ -65,7 +68,7 @@ class PoolManager:
         self.pool = pool
         self.scheduler = scheduler
         self.cluster_connector = ClusterConnector.load(self.cluster, self.pool, self.scheduler)
-        self.pool_config = staticconf.NamespaceReaders(POOL_NAMESPACE.format(pool=self.pool, scheduler=self.scheduler))
+        self.pool_config = get_namespace_reader(POOL_NAMESPACE.format(pool=self.pool, scheduler=self.scheduler))
 
         self.draining_enabled = self.pool_config.read_bool('draining_enabled', default=False)
         self.draining_client: Optional[DrainingClient] = DrainingClient(cluster) if self.draining_enabled else None
@@ -266,7 +269,9 @@ class PoolManager:
     ) -> float:
         """ Signals can return arbitrary values, so make sure we don't add or remove too much capacity """
 
-        requested_delta = requested_target_capacity - self.target_capacity
+        # target_capacity is summed over all of the resource groups on each access, so only compute it once here
+        current_target_capacity = self.target_capacity
+        requested_delta = requested_target_capacity - current_target_capacity
 
         # first, determine whether or not the delta is actually positive or negative.
         # for example, if the current target capacity is above the maximum, the resulting delta
@@ -275,9 +280,9 @@ class PoolManager:
         # limit, in the case of the example, towards the maximum, since the target capacity
         # is currently above the maximum.
         if requested_delta > 0:
-            delta = min(self.max_capacity - self.target_capacity, requested_delta)
+            delta = min(self.max_capacity - current_target_capacity, requested_delta)
         elif requested_delta < 0:
-            delta = max(self.min_capacity - self.target_capacity, requested_delta)
+            delta = max(self.min_capacity - current_target_capacity, requested_delta)
         else:
             delta = 0
 
@@ -292,10 +297,10 @@ class PoolManager:
         if no_scale_down:
             delta = max(delta, 0)
 
-        constrained_target_capacity = self.target_capacity + delta
+        constrained_target_capacity = current_target_capacity + delta
         if requested_delta != delta:
             if force:
-                forced_target_capacity = self.target_capacity + requested_delta
+                forced_target_capacity = current_target_capacity + requested_delta
                 logger.warning(
                     f'Forcing target capacity to {forced_target_capacity} even though '
                     f'scaling limits would restrict to {constrained_target_capacity}.'
@@ -437,20 +442,26 @@ class PoolManager:
             else:
                 return targets[group.id] + coeff < group.min_capacity
 
-        while sum(targets.values()) * coeff < math.ceil(new_target_capacity) * coeff:
-            try:
-                group = sorted(
-                    [g for g in non_stale_groups if not is_constrained(g)],
-                    key=lambda g: (coeff * targets[g.id], g.id),
-                )[0]
-            except IndexError:
+        # This loop runs once per unit of capacity we're adding or removing, so keep a running total of the targets, and
+        # keep the unconstrained groups in a heap ordered by (target, id) so we can pick out the next group to change in
+        # O(log n).  Only the group we just changed can become constrained, and once a group is constrained it stays
+        # that way (its target only moves further in the same direction), so we just don't push it back on the heap.
+        total_target = sum(targets.values())
+        group_heap = [(coeff * targets[g.id], g.id, g) for g in non_stale_groups if not is_constrained(g)]
+        heapify(group_heap)
+        while total_target * coeff < math.ceil(new_target_capacity) * coeff:
+            if not group_heap:
                 logger.warning(' '.join([
                     'All resource groups are stale or constrained.',
-                    f'The closest we could get to {new_target_capacity} is {sum(targets.values())}',
+                    f'The closest we could get to {new_target_capacity} is {total_target}',
                 ]))
                 break
 
-            targets[group.id] += coeff
+            __, group_id, group = heappop(group_heap)
+            targets[group_id] += coeff
+            total_target += coeff
+            if not is_constrained(group):
+                heappush(group_heap, (coeff * targets[group_id], group_id, group))
 
         return targets
 
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import pprint
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 from typing import Iterable
 from typing import List
 from typing import Mapping
@@ -23,6 +25,7 @@ import colorlog
 from cachetools.func import ttl_cache
 
 from clusterman.aws.aws_resource_group import AWSResourceGroup
+from clusterman.aws.aws_resource_group import MAX_CONCURRENT_BATCH_REQUESTS
 from clusterman.aws.aws_resource_group import RESOURCE_GROUP_CACHE_SECONDS
 from clusterman.aws.client import autoscaling
 from clusterman.aws.client import ec2
@@ -37,6 +40,7 @@ from clusterman.interfaces.types import InstanceMetadata
 from clusterman.util import ClustermanResources
 
 _BATCH_MODIFY_SIZE = 200
+_DESCRIBE_NAMES_BATCH_SIZE = 50  # describe_auto_scaling_groups only accepts 50 names at a time
 CLUSTERMAN_STALE_TAG = 'clusterman:is_stale'
 
 logger = colorlog.getLogger(__name__)
@@ -55,7 +59,14 @@ class AutoScalingResourceGroup(AWSResourceGroup):
     AutoScalingResourceGroup will assume that instances are indeed protected.
     """
 
-    def __init__(self, group_id: str) -> None:
+    def __init__(
+        self,
+        group_id: str,
+        group_configs: Optional[Mapping[str, AutoScalingGroupConfig]] = None,
+    ) -> None:
+        # If we were given this group's config (e.g., by load) we use it for the initial load instead of describing
+        # the group again; any later reloads will query AWS for up-to-date data
+        self._initial_group_config = (group_configs or {}).get(group_id)
         super().__init__(group_id)
 
     def market_weight(self, market: InstanceMarket) -> float:
@@ -77,12 +88,14 @@ class AutoScalingResourceGroup(AWSResourceGroup):
             return 0
 
     def mark_stale(self, dry_run: bool) -> None:
-        for i in range(0, len(self.instance_ids), _BATCH_MODIFY_SIZE):
-            inst_list = self.instance_ids[i:i + _BATCH_MODIFY_SIZE]
+        instance_ids = self.instance_ids
+        batches = [instance_ids[i:i + _BATCH_MODIFY_SIZE] for i in range(0, len(instance_ids), _BATCH_MODIFY_SIZE)]
+        for inst_list in batches:
             logger.info(f'Setting staleness tags for {inst_list}')
-            if dry_run:
-                continue
+        if dry_run or not batches:
+            return
 
+        def tag_batch(inst_list: List[str]) -> None:
             ec2.create_tags(
                 Resources=inst_list,
                 Tags=[{
@@ -91,6 +104,10 @@ class AutoScalingResourceGroup(AWSResourceGroup):
                 }],
             )
 
+        # The tagging requests are independent of each other, so send them concurrently
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_BATCH_REQUESTS, len(batches))) as executor:
+            list(executor.map(tag_batch, batches))
+
     def modify_target_capacity(
         self,
         target_capacity: float,
@@ -116,18 +133,19 @@ class AutoScalingResourceGroup(AWSResourceGroup):
         target_capacity += self._stale_capacity
 
         # Round target_cpacity to min or max if necessary
-        if target_capacity > self.max_capacity:
+        min_capacity, max_capacity = self.min_capacity, self.max_capacity
+        if target_capacity > max_capacity:
             logger.warning(
-                f'New target_capacity={target_capacity} exceeds ASG MaxSize={self.max_capacity}, '
+                f'New target_capacity={target_capacity} exceeds ASG MaxSize={max_capacity}, '
                 'setting to max instead'
             )
-            target_capacity = self.max_capacity
-        elif target_capacity < self.min_capacity:
+            target_capacity = max_capacity
+        elif target_capacity < min_capacity:
             logger.warning(
-                f'New target_capacity={target_capacity} falls below ASG MinSize={self.min_capacity}, '
+                f'New target_capacity={target_capacity} falls below ASG MinSize={min_capacity}, '
                 'setting to min instead'
             )
-            target_capacity = self.min_capacity
+            target_capacity = min_capacity
 
         kwargs = dict(
             AutoScalingGroupName=self.group_id,
@@ -177,6 +195,10 @@ class AutoScalingResourceGroup(AWSResourceGroup):
         self._stale_instance_ids = self._get_stale_instance_ids()
 
     def _get_auto_scaling_group_config(self) -> AutoScalingGroupConfig:
+        if self._initial_group_config is not None:
+            group_config, self._initial_group_config = self._initial_group_config, None
+            return group_config
+
         response = autoscaling.describe_auto_scaling_groups(
             AutoScalingGroupNames=[self.group_id],
         )
@@ -216,7 +238,9 @@ class AutoScalingResourceGroup(AWSResourceGroup):
                 },
             ]
         )
-        return [item['ResourceId'] for item in response.get('Tags', []) if item['ResourceId'] in self.instance_ids]
+        # instance_ids builds a new list every time it's accessed, so only do that once
+        instance_ids = set(self.instance_ids)
+        return [item['ResourceId'] for item in response.get('Tags', []) if item['ResourceId'] in instance_ids]
 
     def _get_options_for_instance_type(
         self,
@@ -305,10 +329,30 @@ class AutoScalingResourceGroup(AWSResourceGroup):
                 asg_id_to_tags[asg['AutoScalingGroupName']] = tags_dict
         return asg_id_to_tags
 
+    @classmethod
+    def load(cls, cluster: str, pool: str, config: Any, **kwargs: Any) -> Mapping[str, 'AWSResourceGroup']:
+        """ Loads the ASGs in the given cluster and pool, initializing all of them from a single describe call
+
+        :param cluster: A cluster name
+        :param pool: A pool name
+        :param config: An ASG config
+        :returns: A dictionary of ASG resource groups, indexed by the id
+        """
+        group_ids = cls._get_matching_resource_group_ids(cluster, pool, config)
+        group_configs = {}
+        for i in range(0, len(group_ids), _DESCRIBE_NAMES_BATCH_SIZE):
+            pages = autoscaling.get_paginator('describe_auto_scaling_groups').paginate(
+                AutoScalingGroupNames=group_ids[i:i + _DESCRIBE_NAMES_BATCH_SIZE],
+            )
+            for page in pages:
+                group_configs.update({asg['AutoScalingGroupName']: asg for asg in page['AutoScalingGroups']})
+        return cls._load_resource_groups(group_ids, group_configs=group_configs, **kwargs)
+
     @property
     def _stale_capacity(self) -> float:
+        stale_instance_ids = set(self.stale_instance_ids)
         return sum(
             [int(instance.get('WeightedCapacity', '1'))
              for instance in self._group_config.get('Instances', [])
-             if instance['InstanceId'] in self.stale_instance_ids]
+             if instance['InstanceId'] in stale_instance_ids]
         )
@@ -14,18 +14,22 @@
 from abc import ABCMeta
 from abc import abstractmethod
 from abc import abstractproperty
+from collections import Counter
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from socket import gethostbyaddr
 from typing import Any
 from typing import Collection
+from typing import Iterable
 from typing import List
 from typing import Mapping
+from typing import MutableMapping
 from typing import Optional
 from typing import Sequence
 
 import arrow
 import colorlog
-import simplejson as json
+import orjson
 
 from clusterman.aws.client import ec2
 from clusterman.aws.client import ec2_describe_instances
@@ -37,6 +41,7 @@ from clusterman.interfaces.resource_group import ResourceGroup
 
 logger = colorlog.getLogger(__name__)
 RESOURCE_GROUP_CACHE_SECONDS = 60
+MAX_CONCURRENT_BATCH_REQUESTS = 8
 
 
 def protect_unowned_instances(func):
@@ -66,10 +71,14 @@ class AWSResourceGroup(ResourceGroup, metaclass=ABCMeta):
         # This is expected to populate self.instance_ids, which has to be done _before_
         # we populate the instances by market
         self._reload_resource_group()
-        self._instances_by_market = self._get_instances_by_market()
+        self._instance_counts_by_market = self._get_instance_counts_by_market()
 
     def get_instance_metadatas(self, state_filter: Optional[Collection[str]] = None) -> Sequence[InstanceMetadata]:
         instance_metadatas = []
+        # build the stale lookup once up front; for a stale group this is every instance in the group, so checking
+        # membership in the list for each instance would be quadratic
+        stale_instance_ids = set(self.stale_instance_ids)
+        now = arrow.now()
         for instance_dict in ec2_describe_instances(instance_ids=self.instance_ids):
             aws_state = instance_dict['State']['Name']
             if state_filter and aws_state not in state_filter:
@@ -84,10 +93,10 @@ class AWSResourceGroup(ResourceGroup, metaclass=ABCMeta):
                 hostname=hostname,
                 instance_id=instance_dict['InstanceId'],
                 ip_address=instance_ip,
-                is_stale=(instance_dict['InstanceId'] in self.stale_instance_ids),
+                is_stale=(instance_dict['InstanceId'] in stale_instance_ids),
                 market=instance_market,
                 state=aws_state,
-                uptime=(arrow.now() - arrow.get(instance_dict['LaunchTime'])),
+                uptime=(now - arrow.get(instance_dict['LaunchTime'])),
                 weight=self.market_weight(instance_market),
             )
             instance_metadatas.append(metadata)
@@ -103,38 +112,63 @@ class AWSResourceGroup(ResourceGroup, metaclass=ABCMeta):
 
         :param instance_ids: a list of instance IDs to terminate
         :param batch_size: number of instances to terminate at one time
-        :returns: a list of terminated instance IDs
+        :returns: a list of terminated instance IDs; if some (but not all) of the batches fail, the failures are
+            logged and the instances in those batches are left out of the list
+        :raises: the first batch's error if none of the batches could be terminated
         """
         if not instance_ids:
             logger.warning(f'No instances to terminate in {self.group_id}')
             return []
 
         instance_weights = {}
+        skipped_instance_ids = set()
         for instance in ec2_describe_instances(instance_ids):
             instance_market = get_instance_market(instance)
             if not instance_market.az:
                 logger.warning(
                     f"Instance {instance['InstanceId']} missing AZ info, likely already terminated so skipping",
                 )
-                instance_ids.remove(instance['InstanceId'])
+                skipped_instance_ids.add(instance['InstanceId'])
                 continue
-            instance_weights[instance['InstanceId']] = self.market_weight(get_instance_market(instance))
+            instance_weights[instance['InstanceId']] = self.market_weight(instance_market)
+        instance_ids = [instance_id for instance_id in instance_ids if instance_id not in skipped_instance_ids]
 
         # AWS API recommends not terminating more than 1000 instances at a time, and to
-        # terminate larger numbers in batches
-        terminated_instance_ids = []
-        for batch in range(0, len(instance_ids), batch_size):
-            response = ec2.terminate_instances(InstanceIds=instance_ids[batch:batch + batch_size])
-            terminated_instance_ids.extend([instance['InstanceId'] for instance in response['TerminatingInstances']])
+        # terminate larger numbers in batches; the batches are independent, so send them concurrently
+        batches = [instance_ids[i:i + batch_size] for i in range(0, len(instance_ids), batch_size)]
+
+        batch_errors: List[Exception] = []
+
+        def terminate_batch(batch: List[str]) -> List[str]:
+            # If one batch fails, keep going with the others so that we can still report which instances did get
+            # terminated; the failed batch's instances show up as missing below
+            try:
+                response = ec2.terminate_instances(InstanceIds=batch)
+            except Exception as e:
+                logger.exception(f'Failed to terminate a batch of {len(batch)} instances in {self.id}: {batch}')
+                batch_errors.append(e)
+                return []
+            return [instance['InstanceId'] for instance in response['TerminatingInstances']]
+
+        terminated_instance_ids: List[str] = []
+        if len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_BATCH_REQUESTS, len(batches))) as executor:
+                for batch_terminated_ids in executor.map(terminate_batch, batches):
+                    terminated_instance_ids.extend(batch_terminated_ids)
+        else:
+            for batch in batches:
+                terminated_instance_ids.extend(terminate_batch(batch))
+        if batch_errors and not terminated_instance_ids:
+            raise batch_errors[0]
 
         # It's possible that not every instance is terminated.  The most likely cause for this
         # is that AWS terminated the instance in between getting its status and the terminate_instances
         # request.  This is probably fine but let's log a warning just in case.
-        missing_instances = set(instance_ids) - set(terminated_instance_ids)
+        missing_instances = set(instance_ids).difference(terminated_instance_ids)
         if missing_instances:
             logger.warning('Some instances could not be terminated; they were probably killed previously')
             logger.warning(f'Missing instances: {list(missing_instances)}')
-        terminated_capacity = sum(instance_weights[i] for i in instance_ids)
+        terminated_capacity = sum(instance_weights.get(i, 0) for i in instance_ids)
 
         logger.info(f'{self.id} terminated weight: {terminated_capacity}; instances: {terminated_instance_ids}')
         return terminated_instance_ids
@@ -147,8 +181,8 @@ class AWSResourceGroup(ResourceGroup, metaclass=ABCMeta):
     @property
     def market_capacities(self) -> Mapping[InstanceMarket, float]:
         return {
-            market: len(instances) * self.market_weight(market)
-            for market, instances in self._instances_by_market.items()
+            market: instance_count * self.market_weight(market)
+            for market, instance_count in self._instance_counts_by_market.items()
             if market.az
         }
 
@@ -166,12 +200,23 @@ class AWSResourceGroup(ResourceGroup, metaclass=ABCMeta):
             return 0
         return self._target_capacity
 
-    def _get_instances_by_market(self):
+    def _get_instance_counts_by_market(self) -> Mapping[InstanceMarket, int]:
         """ Responses from this API call are cached to prevent hitting any AWS request limits """
-        instance_dict: Mapping[InstanceMarket, List[Mapping]] = defaultdict(list)
-        for instance in ec2_describe_instances(self.instance_ids):
-            instance_dict[get_instance_market(instance)].append(instance)
-        return instance_dict
+        # The instances in a resource group only come from a handful of (instance type, subnet) combinations, so count
+        # those up first and then only look up the market once for each combination
+        location_counts = Counter(
+            (instance['InstanceType'], instance.get('SubnetId'), instance.get('Placement', {}).get('AvailabilityZone'))
+            for instance in ec2_describe_instances(self.instance_ids)
+        )
+        instance_counts: MutableMapping[InstanceMarket, int] = defaultdict(int)
+        for (instance_type, subnet_id, az), count in location_counts.items():
+            market = get_instance_market({
+                'InstanceType': instance_type,
+                'SubnetId': subnet_id,
+                'Placement': {'AvailabilityZone': az},
+            })
+            instance_counts[market] += count
+        return instance_counts
 
     @abstractproperty
     def _target_capacity(self):  # pragma: no cover
@@ -186,23 +231,38 @@ class AWSResourceGroup(ResourceGroup, metaclass=ABCMeta):
         :param config: a config specific to a resource group type
         :returns: a dictionary of resource groups, indexed by id
         """
+        return cls._load_resource_groups(cls._get_matching_resource_group_ids(cluster, pool, config), **kwargs)
+
+    @classmethod
+    def _get_matching_resource_group_ids(cls, cluster: str, pool: str, config: Any) -> List[str]:
+        """ Find the resource groups whose identifier tag matches the given cluster and pool """
         resource_group_tags = cls._get_resource_group_tags()
-        matching_resource_groups = {}
+        matching_resource_group_ids = []
 
         try:
             identifier_tag_label = config['tag']
         except KeyError:
-            return {}
+            return []
 
         for rg_id, tags in resource_group_tags.items():
             try:
                 tag_json = tags.get(identifier_tag_label)
                 # Not every ASG/SFR/etc will have the right tags, because they belong to someone else
                 if tag_json:
-                    identifier_tags = json.loads(tag_json)
+                    identifier_tags = orjson.loads(tag_json)
                     if identifier_tags['pool'] == pool and identifier_tags['paasta_cluster'] == cluster:
-                        rg = cls(rg_id, **kwargs)
-                        matching_resource_groups[rg_id] = rg
+                        matching_resource_group_ids.append(rg_id)
+            except Exception:
+                logger.exception(f'Could not load resource group {rg_id}; skipping...')
+                continue
+        return matching_resource_group_ids
+
+    @classmethod
+    def _load_resource_groups(cls, rg_ids: Iterable[str], **kwargs: Any) -> Mapping[str, 'AWSResourceGroup']:
+        matching_resource_groups = {}
+        for rg_id in rg_ids:
+            try:
+                matching_resource_groups[rg_id] = cls(rg_id, **kwargs)
             except Exception:
                 logger.exception(f'Could not load resource group {rg_id}; skipping...')
                 continue
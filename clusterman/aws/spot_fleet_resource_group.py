@@ -12,13 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from typing import Any
+from typing import Collection
+from typing import Dict
 from typing import Iterable
 from typing import Mapping
 from typing import Sequence
 
 import botocore
 import colorlog
-import simplejson as json
+import orjson
 from cachetools.func import ttl_cache
 from mypy_extensions import TypedDict
 
@@ -162,10 +164,13 @@ class SpotFleetResourceGroup(AWSResourceGroup):
         """
         tagged_resource_groups = super().load(cluster, pool, config)
         if 's3' in config:
+            # Building an SFR resource group queries AWS for its configuration and instances, so don't load anything
+            # from S3 that we've already found via its tags
             s3_resource_groups = load_spot_fleets_from_s3(
                 config['s3']['bucket'],
                 config['s3']['prefix'],
                 pool=pool,
+                exclude_ids=tagged_resource_groups.keys(),
             )
             logger.info(f'SFRs loaded from s3: {list(s3_resource_groups)}')
         else:
@@ -213,18 +218,25 @@ class SpotFleetResourceGroup(AWSResourceGroup):
         raise NotImplementedError()
 
 
-def load_spot_fleets_from_s3(bucket: str, prefix: str, pool: str = None) -> Mapping[str, SpotFleetResourceGroup]:
+def load_spot_fleets_from_s3(
+    bucket: str,
+    prefix: str,
+    pool: str = None,
+    exclude_ids: Collection[str] = (),
+) -> Mapping[str, SpotFleetResourceGroup]:
     prefix = prefix.rstrip('/') + '/'
     object_list = s3.list_objects_v2(Bucket=bucket, Prefix=prefix)
-    spot_fleets = {}
+    spot_fleets: Dict[str, SpotFleetResourceGroup] = {}
     for obj_metadata in object_list['Contents']:
         obj = s3.get_object(Bucket=bucket, Key=obj_metadata['Key'])
-        sfr_metadata = json.load(obj['Body'])
+        sfr_metadata = orjson.loads(obj['Body'].read())
         for resource_key, resource in sfr_metadata['cluster_autoscaling_resources'].items():
             if not resource_key.startswith('aws_spot_fleet_request'):
                 continue
             if pool and resource['pool'] != pool:
                 continue
+            if resource['id'] in spot_fleets or resource['id'] in exclude_ids:
+                continue
 
             spot_fleets[resource['id']] = SpotFleetResourceGroup(resource['id'])
 
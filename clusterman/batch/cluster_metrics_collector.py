@@ -22,6 +22,7 @@ from typing import List
 from typing import Mapping
 from typing import MutableMapping
 from typing import NamedTuple
+from typing import Sequence
 from typing import Type
 from typing import Union
 
@@ -94,7 +95,7 @@ class ClusterMetricsCollector(BatchDaemon, BatchLoggingMixin, BatchRunningSentin
 
         # Since we want to collect metrics for all the pools, we need to call setup_config
         # first to load the cluster config path, and then read all the entries in that directory
-        self.pools: MutableMapping[str, List[str]] = {}
+        self.pools: MutableMapping[str, Sequence[str]] = {}
         for scheduler in {'mesos', 'kubernetes'}:
             self.pools[scheduler] = get_pool_name_list(self.options.cluster, scheduler)
         for scheduler, pools in self.pools.items():
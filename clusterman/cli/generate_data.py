@@ -24,6 +24,12 @@ from clusterman.simulator.io import write_object_to_compressed_json
 from clusterman.util import parse_time_interval_seconds
 from clusterman.util import parse_time_string
 
+try:
+    # the libyaml-backed loader is much faster than the pure-python one, so use it if it's available
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore
+
 
 def get_values_function(values_conf):
     """ Returns a function to generate metric values based on configuration
@@ -131,7 +137,7 @@ def load_experimental_design(inputfile):
     :returns: a dictionary of metric_type -> (metric_name -> timeseries data)
     """
     with open(inputfile) as f:
-        design = yaml.safe_load(f.read())
+        design = yaml.load(f, Loader=SafeLoader)
 
     metrics = {}
     for metric_type, metric_design in design.items():
@@ -13,11 +13,16 @@
 # limitations under the License.
 import argparse
 import sys
+from collections import defaultdict
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Mapping
 from typing import Optional
 from typing import Sequence
+from typing import Set
 
 import arrow
 import simplejson as json
@@ -44,6 +49,26 @@ from clusterman.util import autoscaling_is_paused
 from clusterman.util import ClustermanResources
 from clusterman.util import color_conditions
 
+# The color conditions don't change between calls, so build them once instead of once per resource group/agent
+# (callers pass prefix and postfix explicitly, so that none of these conditions can be bound to them instead)
+# TODO (CLUSTERMAN-100) These are just the status responses for spot fleets; this probably won't
+# extend to other types of resource groups, so we should figure out what to do about that.
+_RESOURCE_GROUP_STATUS_COLORS: Mapping[str, Callable[[Any], bool]] = dict(
+    green=any_of('active',),
+    blue=any_of('modifying', 'submitted'),
+    red=any_of('cancelled', 'failed', 'cancelled_running', 'cancelled_terminating'),
+)
+_AWS_STATE_COLORS: Mapping[str, Callable[[Any], bool]] = dict(
+    green=any_of('running',),
+    blue=any_of('pending',),
+    red=any_of('shutting-down', 'terminated', 'stopping', 'stopped'),
+)
+_AGENT_STATE_COLORS: Mapping[str, Callable[[Any], bool]] = dict(
+    green=any_of(AgentState.RUNNING,),
+    blue=any_of(AgentState.IDLE,),
+    red=any_of(AgentState.ORPHANED, AgentState.UNKNOWN),
+)
+
 
 class ResourceDictJsonObject(TypedDict):
     allocated: float
@@ -100,17 +125,18 @@ def _get_resource_groups_json(
     groups: Iterable[ResourceGroup],
     node_metadatas: Sequence[ClusterNodeMetadata],
 ) -> List[ResourceGroupJsonObject]:
+    # Bucket the agents by resource group up front, instead of scanning every agent once for each group
+    agents_by_group_id: Dict[str, List[AgentJsonObject]] = defaultdict(list)
+    for metadata in node_metadatas:
+        agents_by_group_id[metadata.instance.group_id].append(_get_agent_json(metadata))
+
     return [
         {
             'id': group.id,
             'fulfilled_capacity': group.fulfilled_capacity,
             'target_capacity': group.target_capacity,
             'status': group.status,
-            'agents': [
-                _get_agent_json(metadata)
-                for metadata in node_metadatas
-                if metadata.instance.group_id == group.id
-            ]
+            'agents': agents_by_group_id.get(group.id, []),
         }
         for group in groups
     ]
@@ -127,41 +153,24 @@ def _status_json(manager: PoolManager, get_node_metadatas: bool) -> StatusJsonOb
     }
 
 
-def _write_resource_group_line(group) -> None:
-    # TODO (CLUSTERMAN-100) These are just the status responses for spot fleets; this probably won't
-    # extend to other types of resource groups, so we should figure out what to do about that.
-    status_str = color_conditions(
-        group['status'],
-        green=any_of('active',),
-        blue=any_of('modifying', 'submitted'),
-        red=any_of('cancelled', 'failed', 'cancelled_running', 'cancelled_terminating'),
-    )
-    print(f'\t{group["id"]}: {status_str} ({group["fulfilled_capacity"]} / {group["target_capacity"]})')
+def _format_resource_group_line(group) -> str:
+    status_str = color_conditions(group['status'], prefix=None, postfix=None, **_RESOURCE_GROUP_STATUS_COLORS)
+    return f'\t{group["id"]}: {status_str} ({group["fulfilled_capacity"]} / {group["target_capacity"]})\n'
 
 
-def _write_agent_details(agent: AgentJsonObject) -> None:
-    agent_aws_state = color_conditions(
-        agent['aws_state'],
-        green=any_of('running',),
-        blue=any_of('pending',),
-        red=any_of('shutting-down', 'terminated', 'stopping', 'stopped'),
-    )
-    print(
+def _format_agent_details(agent: AgentJsonObject) -> str:
+    agent_aws_state = color_conditions(agent['aws_state'], prefix=None, postfix=None, **_AWS_STATE_COLORS)
+    output_str = (
         f'\t - {agent["instance_id"]} {agent["market"]} '
         f'({agent["ip_address"]}): {agent_aws_state}, up for '
-        f'{format_timespan(agent["uptime"], max_units=1)}'
+        f'{format_timespan(agent["uptime"], max_units=1)}\n'
     )
 
-    agent_state = color_conditions(
-        agent['agent_state'],
-        green=any_of(AgentState.RUNNING,),
-        blue=any_of(AgentState.IDLE,),
-        red=any_of(AgentState.ORPHANED, AgentState.UNKNOWN),
-    )
-    sys.stdout.write(f'\t   {agent_state} ')
+    agent_state = color_conditions(agent['agent_state'], prefix=None, postfix=None, **_AGENT_STATE_COLORS)
+    output_str += f'\t   {agent_state} '
 
     if agent['agent_state'] == AgentState.RUNNING:
-        output_str = f'{agent["task_count"]} tasks; '
+        output_str += f'{agent["task_count"]} tasks; '
         resource_strings = []
         for resource in ClustermanResources._fields:
             allocated, total = agent['resources'][resource]['allocated'], agent['resources'][resource]['total']
@@ -179,24 +188,29 @@ def _write_agent_details(agent: AgentJsonObject) -> None:
             else:
                 resource_strings.append(resource + ': None')
 
-        sys.stdout.write(output_str + ', '.join(resource_strings))
-    sys.stdout.write('\n')
-
-
-def _write_summary(manager: PoolManager) -> None:
-    print('Cluster statistics:')
-    total_cpus = manager.cluster_connector.get_resource_total('cpus')
-    total_mem = format_size(manager.cluster_connector.get_resource_total('mem') * 1000000)
-    total_disk = format_size(manager.cluster_connector.get_resource_total('disk') * 1000000)
-    total_gpus = manager.cluster_connector.get_resource_total('gpus')
-    allocated_cpus = manager.cluster_connector.get_resource_allocation('cpus')
-    allocated_mem = format_size(manager.cluster_connector.get_resource_allocation('mem') * 1000000)
-    allocated_disk = format_size(manager.cluster_connector.get_resource_allocation('disk') * 1000000)
-    allocated_gpus = manager.cluster_connector.get_resource_allocation('gpus')
-    print(f'\tCPU allocation: {allocated_cpus:.1f} CPUs allocated to tasks, {total_cpus:.1f} total')
-    print(f'\tMemory allocation: {allocated_mem} memory allocated to tasks, {total_mem} total')
-    print(f'\tDisk allocation: {allocated_disk} disk space allocated to tasks, {total_disk} total')
-    print(f'\tGPUs allocation: {allocated_gpus} GPUs allocated to tasks, {total_gpus} total')
+        output_str += ', '.join(resource_strings)
+    return output_str + '\n'
+
+
+def _format_summary(manager: PoolManager) -> str:
+    # Compute all of the totals/allocations in one pass over the agents, instead of once per resource
+    total_resources = manager.cluster_connector.get_cluster_total_resources()
+    allocated_resources = manager.cluster_connector.get_cluster_allocated_resources()
+    total_cpus = total_resources.cpus
+    total_mem = format_size(total_resources.mem * 1000000)
+    total_disk = format_size(total_resources.disk * 1000000)
+    total_gpus = total_resources.gpus
+    allocated_cpus = allocated_resources.cpus
+    allocated_mem = format_size(allocated_resources.mem * 1000000)
+    allocated_disk = format_size(allocated_resources.disk * 1000000)
+    allocated_gpus = allocated_resources.gpus
+    return (
+        'Cluster statistics:\n'
+        f'\tCPU allocation: {allocated_cpus:.1f} CPUs allocated to tasks, {total_cpus:.1f} total\n'
+        f'\tMemory allocation: {allocated_mem} memory allocated to tasks, {total_mem} total\n'
+        f'\tDisk allocation: {allocated_disk} disk space allocated to tasks, {total_disk} total\n'
+        f'\tGPUs allocation: {allocated_gpus} GPUs allocated to tasks, {total_gpus} total\n'
+    )
 
 
 def print_status_json(manager: PoolManager):
@@ -205,29 +219,39 @@ def print_status_json(manager: PoolManager):
 
 def print_status(manager: PoolManager, args: argparse.Namespace) -> None:
     status_obj = _status_json(manager, get_node_metadatas=args.verbose)
-    sys.stdout.write('\n')
-    print(f'Current status for the {manager.pool} pool in the {manager.cluster} cluster:\n')
+
+    # For a large pool there can be thousands of lines here, so build up the whole output and write it all at once
+    output = ['\n', f'Current status for the {manager.pool} pool in the {manager.cluster} cluster:\n\n']
     if status_obj['disabled']:
-        print(Fore.RED + 'Autoscaling is currently PAUSED!!!\n' + Style.RESET_ALL)
+        output.append(Fore.RED + 'Autoscaling is currently PAUSED!!!\n' + Style.RESET_ALL + '\n')
 
-    print(
+    output.append(
         f'Resource groups (target capacity: {status_obj["target_capacity"]}, '
         f'fulfilled: {status_obj["fulfilled_capacity"]}, '
-        f'non-orphan: {status_obj["non_orphan_fulfilled_capacity"]}):'
+        f'non-orphan: {status_obj["non_orphan_fulfilled_capacity"]}):\n'
     )
 
+    # The filter flags are the same for every agent, so work out which states we're showing once up front
+    allowed_agent_states: Optional[Set[AgentState]] = None
+    if args.only_orphans or args.only_idle:
+        allowed_agent_states = set(AgentState)
+        if args.only_orphans:
+            allowed_agent_states &= {AgentState.ORPHANED}
+        if args.only_idle:
+            allowed_agent_states &= {AgentState.IDLE}
+
     for group in status_obj['resource_groups']:
-        _write_resource_group_line(group)
+        output.append(_format_resource_group_line(group))
         for metadata in group['agents']:
-            if ((args.only_orphans and metadata['agent_state'] != AgentState.ORPHANED) or
-                    (args.only_idle and metadata['agent_state'] != AgentState.IDLE)):
+            if allowed_agent_states is not None and metadata['agent_state'] not in allowed_agent_states:
                 continue
-            _write_agent_details(metadata)
+            output.append(_format_agent_details(metadata))
 
-        sys.stdout.write('\n')
+        output.append('\n')
 
-    _write_summary(manager)
-    sys.stdout.write('\n')
+    output.append(_format_summary(manager))
+    output.append('\n')
+    sys.stdout.write(''.join(output))
 
 
 @timeout_wrapper
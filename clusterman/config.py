@@ -13,6 +13,7 @@
 # limitations under the License.
 import argparse
 import os
+from functools import lru_cache
 from typing import Optional
 
 import staticconf
@@ -86,6 +87,16 @@ def load_cluster_pool_config(cluster: str, pool: str, scheduler: str, signals_br
         )
 
 
+@lru_cache(maxsize=None)
+def get_namespace_reader(namespace: str) -> 'staticconf.NamespaceAccessor':
+    """ Return a (shared) staticconf reader for the given namespace
+
+    The readers look up the namespace on every read, so it's safe to hand the same one out to every object
+    that needs to read from a particular namespace.
+    """
+    return staticconf.NamespaceReaders(namespace)
+
+
 def get_cluster_config_directory(cluster):
     return os.path.join(staticconf.read_string('cluster_config_directory'), cluster)
 
@@ -15,8 +15,7 @@ from abc import ABCMeta
 from abc import abstractmethod
 from typing import Optional
 
-import staticconf
-
+from clusterman.config import get_namespace_reader
 from clusterman.config import POOL_NAMESPACE
 from clusterman.interfaces.types import AgentMetadata
 from clusterman.util import ClustermanResources
@@ -28,7 +27,7 @@ class ClusterConnector(metaclass=ABCMeta):
     def __init__(self, cluster: str, pool: Optional[str]) -> None:
         self.cluster = cluster
         self.pool = pool
-        self.pool_config = staticconf.NamespaceReaders(POOL_NAMESPACE.format(pool=self.pool, scheduler=self.SCHEDULER))
+        self.pool_config = get_namespace_reader(POOL_NAMESPACE.format(pool=self.pool, scheduler=self.SCHEDULER))
 
     @abstractmethod
     def reload_state(self) -> None:  # pragma: no cover
@@ -14,12 +14,16 @@
 from abc import ABCMeta
 from abc import abstractmethod
 from collections import defaultdict
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import NamedTuple
+from typing import Tuple
 from typing import Union
 
 import arrow
-import staticconf
 from clusterman_metrics import APP_METRICS
 from clusterman_metrics import ClustermanMetricsBotoClient
 from clusterman_metrics import MetricsValuesDict
@@ -27,6 +31,7 @@ from clusterman_metrics import SYSTEM_METRICS
 from kubernetes.client.models.v1_pod import V1Pod as KubernetesPod
 from mypy_extensions import TypedDict
 
+from clusterman.config import get_namespace_reader
 from clusterman.exceptions import MetricsError
 from clusterman.exceptions import SignalValidationError
 from clusterman.util import get_cluster_dimensions
@@ -60,7 +65,7 @@ class Signal(metaclass=ABCMeta):
         :param signal_namespace: the namespace in the signals repo to find the signal class
             (if this is None, we default to the app name)
         """
-        reader = staticconf.NamespaceReaders(config_namespace)
+        reader = get_namespace_reader(config_namespace)
 
         self.name = name
         self.cluster: str = cluster
@@ -72,11 +77,9 @@ class Signal(metaclass=ABCMeta):
         if self.period_minutes <= 0:
             raise SignalValidationError(f'Length of signal period must be positive, got {self.period_minutes}')
 
-        self.parameters: Dict = {
-            key: value
-            for param_dict in reader.read_list('autoscale_signal.parameters', default=[])
-            for (key, value) in param_dict.items()
-        }
+        self.parameters: Dict = {}
+        for param_dict in reader.read_list('autoscale_signal.parameters', default=[]):
+            self.parameters.update(param_dict)
         # Even if cluster and pool were set in parameters, we override them here
         # as we want to preserve a single source of truth
         self.parameters.update(dict(
@@ -101,6 +104,14 @@ class Signal(metaclass=ABCMeta):
         pass
 
 
+class MetricsQuery(NamedTuple):
+    name: str
+    type: str
+    minute_range: int
+    is_regex: bool
+    dimensions: Tuple[Tuple[str, str], ...]
+
+
 def get_metrics_for_signal(
     cluster: str,
     pool: str,
@@ -109,10 +120,25 @@ def get_metrics_for_signal(
     metrics_client: ClustermanMetricsBotoClient,
     required_metrics: List[MetricsConfigDict],
     end_time: arrow.Arrow,
+    max_workers: int = 1,
 ) -> MetricsValuesDict:
     """ Get the metrics required for a signal """
+    queries = get_metrics_queries_for_signal(cluster, pool, scheduler, required_metrics)
+    return run_metrics_queries(app, metrics_client, queries, end_time, max_workers)
 
-    metrics: MetricsValuesDict = defaultdict(list)
+
+def get_metrics_queries_for_signal(
+    cluster: str,
+    pool: str,
+    scheduler: str,
+    required_metrics: List[MetricsConfigDict],
+) -> List[MetricsQuery]:
+    """ Build the full (de-duplicated) list of datastore queries needed to satisfy a signal's required metrics
+
+    The queries only depend on the signal configuration, so callers can build them once and re-use them for
+    every evaluation of the signal.
+    """
+    queries: List[MetricsQuery] = []
     for metric_dict in required_metrics:
         if metric_dict['type'] not in (SYSTEM_METRICS, APP_METRICS):
             raise MetricsError(f"Metrics of type {metric_dict['type']} cannot be queried by signals.")
@@ -132,20 +158,63 @@ def get_metrics_for_signal(
         if 'regex' not in metric_dict:
             metric_dict['regex'] = False
 
-        start_time = end_time.shift(minutes=-metric_dict['minute_range'])
         for dims in dims_list:
-            query_results = metrics_client.get_metric_values(
+            query = MetricsQuery(
                 metric_dict['name'],
                 metric_dict['type'],
-                start_time.timestamp,
-                end_time.timestamp,
-                is_regex=metric_dict['regex'],
-                extra_dimensions=dims,
-                app_identifier=app,
+                metric_dict['minute_range'],
+                metric_dict['regex'],
+                tuple(dims.items()),
             )
-            for metric_name, timeseries in query_results.items():
-                metrics[metric_name].extend(timeseries)
-                # safeguard; the metrics _should_ already be sorted since we inserted the old
-                # (non-scheduler-aware) metrics before the new metrics above, so this should be fast
-                metrics[metric_name].sort()
+            # If the same metric is listed more than once we only need to fetch it from the datastore once
+            if query not in queries:
+                queries.append(query)
+    return queries
+
+
+def run_metrics_queries(
+    app: str,
+    metrics_client: ClustermanMetricsBotoClient,
+    queries: List[MetricsQuery],
+    end_time: arrow.Arrow,
+    max_workers: int = 1,
+) -> MetricsValuesDict:
+    """ Fetch the results for a list of metrics queries ending at end_time
+
+    The datastore queries are network-bound, so if max_workers is greater than 1 they are issued concurrently
+    from a bounded thread pool, and each result is merged in as soon as it arrives instead of waiting for the
+    slowest query to finish.
+    """
+    # Do the time-window math on plain Unix timestamps rather than shifting Arrow objects for every query
+    end_timestamp = end_time.timestamp
+
+    def run_query(query: MetricsQuery) -> MetricsValuesDict:
+        return metrics_client.get_metric_values(
+            query.name,
+            query.type,
+            end_timestamp - query.minute_range * 60,
+            end_timestamp,
+            is_regex=query.is_regex,
+            extra_dimensions=dict(query.dimensions),
+            app_identifier=app,
+        )
+
+    def iter_query_results() -> Iterator[MetricsValuesDict]:
+        num_workers = min(max_workers, len(queries))
+        if num_workers > 1:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                for future in as_completed([executor.submit(run_query, query) for query in queries]):
+                    yield future.result()
+        else:
+            yield from (run_query(query) for query in queries)
+
+    metrics: MetricsValuesDict = defaultdict(list)
+    for query_results in iter_query_results():
+        for metric_name, timeseries in query_results.items():
+            metrics[metric_name].extend(timeseries)
+
+    # Results can come back in any order, so sort each timeseries once everything is in; the individual
+    # query results are already sorted, so this should be fast
+    for timeseries in metrics.values():
+        timeseries.sort()
     return metrics
@@ -37,6 +37,8 @@ from clusterman.kubernetes.util import PodUnschedulableReason
 from clusterman.kubernetes.util import selector_term_matches_requirement
 from clusterman.kubernetes.util import total_node_resources
 from clusterman.kubernetes.util import total_pod_resources
+from clusterman.util import ClustermanResources
+from clusterman.util import sum_resources
 
 logger = colorlog.getLogger(__name__)
 KUBERNETES_SCHEDULED_PHASES = {'Pending', 'Running'}
@@ -94,6 +96,22 @@ class KubernetesClusterConnector(ClusterConnector):
             for node_ip, node in self._nodes_by_ip.items()
         )
 
+    def get_cluster_allocated_resources(self) -> ClustermanResources:
+        return sum_resources(
+            allocated_node_resources(pods) for pods in self._pods_by_ip.values()
+        )
+
+    def get_cluster_total_resources(self) -> ClustermanResources:
+        if self._excluded_pods_by_ip:
+            excluded_resources = sum_resources(
+                allocated_node_resources(self._excluded_pods_by_ip.get(node_ip, [])) for node_ip in self._nodes_by_ip
+            )
+            logger.info(f'Excluded {excluded_resources} from daemonset pods')
+        return sum_resources(
+            total_node_resources(node, self._excluded_pods_by_ip.get(node_ip, []))
+            for node_ip, node in self._nodes_by_ip.items()
+        )
+
     def get_resource_excluded(self, resource_name: str) -> float:
         return sum(
             getattr(allocated_node_resources(self._excluded_pods_by_ip.get(node_ip, [])), resource_name)
@@ -15,6 +15,7 @@ from collections import defaultdict
 from typing import List
 from typing import Mapping
 from typing import MutableMapping
+from typing import Optional
 from typing import Sequence
 from typing import Tuple
 
@@ -34,6 +35,8 @@ from clusterman.mesos.util import MesosFrameworkDict
 from clusterman.mesos.util import MesosFrameworks
 from clusterman.mesos.util import MesosTaskDict
 from clusterman.mesos.util import total_agent_resources
+from clusterman.util import ClustermanResources
+from clusterman.util import sum_resources
 
 logger = colorlog.getLogger(__name__)
 
@@ -55,6 +58,8 @@ class MesosClusterConnector(ClusterConnector):
         )
         self.api_endpoint = f'http://{mesos_master_fqdn}:5050/'
         logger.info(f'Connecting to Mesos masters at {self.api_endpoint}')
+        self._cluster_allocated_resources: Optional[ClustermanResources] = None
+        self._cluster_total_resources: Optional[ClustermanResources] = None
 
     def reload_state(self) -> None:
 
@@ -62,22 +67,36 @@ class MesosClusterConnector(ClusterConnector):
         # all of the tasks and agents
         logger.info('Reloading agents')
         self._agents_by_ip = self._get_agents_by_ip()
+        self._cluster_allocated_resources = None
+        self._cluster_total_resources = None
 
         logger.info('Reloading frameworks and tasks')
         self._tasks, self._frameworks = self._get_tasks_and_frameworks()
         self._task_count_per_agent = self._count_tasks_per_agent()
 
     def get_resource_allocation(self, resource_name: str) -> float:
-        return sum(
-            getattr(allocated_agent_resources(agent), resource_name)
-            for agent in self._agents_by_ip.values()
-        )
+        return getattr(self.get_cluster_allocated_resources(), resource_name)
 
     def get_resource_total(self, resource_name: str) -> float:
-        return sum(
-            getattr(total_agent_resources(agent), resource_name)
-            for agent in self._agents_by_ip.values()
-        )
+        return getattr(self.get_cluster_total_resources(), resource_name)
+
+    def get_cluster_allocated_resources(self) -> ClustermanResources:
+        # The agents don't change until the next reload, but the metrics generators ask for each resource separately,
+        # so add up all of the resources in one pass over the agents and hang on to the result
+        allocated_resources = self._cluster_allocated_resources
+        if allocated_resources is None:
+            allocated_resources = sum_resources(
+                allocated_agent_resources(agent) for agent in self._agents_by_ip.values()
+            )
+            self._cluster_allocated_resources = allocated_resources
+        return allocated_resources
+
+    def get_cluster_total_resources(self) -> ClustermanResources:
+        total_resources = self._cluster_total_resources
+        if total_resources is None:
+            total_resources = sum_resources(total_agent_resources(agent) for agent in self._agents_by_ip.values())
+            self._cluster_total_resources = total_resources
+        return total_resources
 
     def _get_agent_metadata(self, instance_ip: str) -> AgentMetadata:
         agent_dict = self._agents_by_ip.get(instance_ip)
@@ -87,7 +106,7 @@ class MesosClusterConnector(ClusterConnector):
         allocated_resources = allocated_agent_resources(agent_dict)
         return AgentMetadata(
             agent_id=agent_dict['id'],
-            allocated_resources=allocated_agent_resources(agent_dict),
+            allocated_resources=allocated_resources,
             batch_task_count=self._task_count_per_agent[agent_dict['id']]['batch_tasks'],
             state=(AgentState.RUNNING if any(allocated_resources) else AgentState.IDLE),
             task_count=self._task_count_per_agent[agent_dict['id']]['all_tasks'],
@@ -100,11 +119,16 @@ class MesosClusterConnector(ClusterConnector):
             lambda: TaskCount(all_tasks=0, batch_tasks=0),
         )
 
+        # There are far fewer frameworks than tasks, so only check each framework's name against the prefixes once
+        is_batch_by_framework_id: MutableMapping[str, bool] = {}
         for task in self._tasks:
             if task['state'] == 'TASK_RUNNING':
                 instance_id_to_task_count[task['slave_id']]['all_tasks'] += 1
-                framework_name = self._frameworks[task['framework_id']]['name']
-                if self._is_batch_framework(framework_name):
+                framework_id = task['framework_id']
+                if framework_id not in is_batch_by_framework_id:
+                    framework_name = self._frameworks[framework_id]['name']
+                    is_batch_by_framework_id[framework_id] = self._is_batch_framework(framework_name)
+                if is_batch_by_framework_id[framework_id]:
                     instance_id_to_task_count[task['slave_id']]['batch_tasks'] += 1
         return instance_id_to_task_count
 
@@ -134,4 +158,4 @@ class MesosClusterConnector(ClusterConnector):
     def _is_batch_framework(self, framework_name: str) -> bool:
         """If the framework matches any of the prefixes in self.non_batch_framework_prefixes
         this will return False, otherwise we assume the task to be a batch task"""
-        return not any([framework_name.startswith(prefix) for prefix in self.non_batch_framework_prefixes])
+        return not framework_name.startswith(tuple(self.non_batch_framework_prefixes))
@@ -18,12 +18,19 @@ from typing import Sequence
 
 import colorlog
 import requests
+from cachetools.func import ttl_cache
 from mypy_extensions import TypedDict
 
 from clusterman.exceptions import PoolConnectionError
 from clusterman.util import ClustermanResources
 
 logger = colorlog.getLogger(__name__)
+_AGENT_PID_RE = re.compile(r'.+?@([\d\.]+):\d+')
+MESOS_MASTER_CACHE_SECONDS = 30
+
+# Re-use connections to the Mesos masters across requests instead of opening a new one every time
+_MESOS_SESSION = requests.Session()
+_MESOS_SESSION.headers['user-agent'] = 'clusterman'
 
 
 class MesosAgentDict(TypedDict):
@@ -66,7 +73,7 @@ def agent_pid_to_ip(agent_pid: str) -> str:
     :param: agent pid (this is in the format 'slave(1)@10.40.31.172:5051')
     :returns: ip address
     """
-    m = re.match(r'.+?@([\d\.]+):\d+', agent_pid)
+    m = _AGENT_PID_RE.match(agent_pid)
     assert m
     return m.group(1)
 
@@ -81,17 +88,24 @@ def allocated_agent_resources(agent_dict: MesosAgentDict) -> ClustermanResources
     )
 
 
+@ttl_cache(ttl=MESOS_MASTER_CACHE_SECONDS)
+def _get_mesos_master_url(url: str) -> str:
+    """ Find the leading Mesos master; this doesn't change very often, so we cache it for a little while to avoid
+    doubling the number of requests we make to Mesos
+    """
+    return mesos_post(url, 'redirect').url + '/'
+
+
 def mesos_post(url: str, endpoint: str) -> requests.Response:
-    master_url = url if endpoint == 'redirect' else mesos_post(url, 'redirect').url + '/'
+    master_url = url if endpoint == 'redirect' else _get_mesos_master_url(url)
     request_url = master_url + endpoint
     response = None
     try:
-        response = requests.post(
-            request_url,
-            headers={'user-agent': 'clusterman'},
-        )
+        response = _MESOS_SESSION.post(request_url)
         response.raise_for_status()
     except Exception as e:  # there's no one exception class to check for problems with the request :(
+        # the leading master may have changed out from under us, so look it up again next time
+        _get_mesos_master_url.cache_clear()
         log_message = (
             f'Mesos is unreachable:\n\n'
             f'{str(e)}\n'
@@ -11,10 +11,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import atexit
+import queue
+import threading
 import time
 from abc import ABCMeta
 from abc import abstractmethod
 from typing import Any
+from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import Union
 
@@ -28,6 +33,9 @@ except ImportError:
     yelp_meteorite = None
 
 logger = colorlog.getLogger(__name__)
+ASYNC_EMITTER_QUEUE_SIZE = 1024
+_async_emitter_queue: Optional['queue.Queue[Tuple[GaugeProtocol, Union[int, float], Any, Any]]'] = None
+_async_emitter_lock = threading.Lock()
 
 
 class CounterProtocol(Protocol):
@@ -80,6 +88,48 @@ class SignalFXMonitoringClient(MonitoringClient):
         return yelp_meteorite.create_timer(name, *args, **kwargs)
 
 
+def _get_async_emitter_queue() -> 'queue.Queue[Tuple[GaugeProtocol, Union[int, float], Any, Any]]':
+    """ Lazily start the (single) thread that emits values for all AsyncGauges """
+    global _async_emitter_queue
+
+    with _async_emitter_lock:
+        if _async_emitter_queue is None:
+            _async_emitter_queue = queue.Queue(maxsize=ASYNC_EMITTER_QUEUE_SIZE)
+            threading.Thread(
+                target=_emit_async_values,
+                args=(_async_emitter_queue,),
+                name='async-metrics-emitter',
+                daemon=True,
+            ).start()
+            # The emitter thread is a daemon so it can't keep the process alive, so make sure everything that's been
+            # queued up gets sent before we exit
+            atexit.register(_async_emitter_queue.join)
+    return _async_emitter_queue
+
+
+def _emit_async_values(emitter_queue: 'queue.Queue[Tuple[GaugeProtocol, Union[int, float], Any, Any]]') -> None:
+    while True:
+        gauge, value, args, kwargs = emitter_queue.get()
+        try:
+            gauge.set(value, *args, **kwargs)
+        except Exception:
+            logger.exception('Failed to emit gauge value')
+        finally:
+            emitter_queue.task_done()
+
+
+class AsyncGauge(GaugeProtocol):
+    """ Wrap a gauge so that set() hands the value off to a background thread instead of blocking the caller on the
+    metrics emitter; if the emitter falls too far behind, set() waits for room in the queue rather than dropping values
+    """
+
+    def __init__(self, gauge: GaugeProtocol) -> None:
+        self.gauge = gauge
+
+    def set(self, value: Union[int, float], *args: Any, **kwargs: Any) -> None:
+        _get_async_emitter_queue().put((self.gauge, value, args, kwargs))
+
+
 class LogCounter(GaugeProtocol):
     def __init__(self, name: str) -> None:
         self.name = name
@@ -14,7 +14,8 @@
 import os
 import socket
 import struct
-import time
+from decimal import Decimal
+from typing import Any
 from typing import Callable
 from typing import List
 from typing import Mapping
@@ -23,18 +24,19 @@ from typing import Union
 
 import arrow
 import colorlog
-import simplejson as json
+import orjson
 import staticconf
 from clusterman_metrics import ClustermanMetricsBotoClient
 from retry import retry
-from simplejson.errors import JSONDecodeError
 from staticconf.errors import ConfigurationError
 
+from clusterman.config import get_namespace_reader
 from clusterman.config import POOL_NAMESPACE
 from clusterman.exceptions import ClustermanSignalError
 from clusterman.exceptions import NoSignalConfiguredException
 from clusterman.exceptions import SignalConnectionError
-from clusterman.interfaces.signal import get_metrics_for_signal
+from clusterman.interfaces.signal import get_metrics_queries_for_signal
+from clusterman.interfaces.signal import run_metrics_queries
 from clusterman.interfaces.signal import Signal
 from clusterman.util import SignalResourceRequest
 
@@ -74,13 +76,17 @@ class ExternalSignal(Signal):
         :param signal_namespace: the namespace in the signals repo to find the signal class
             (if this is None, we default to the app name)
         """
-        reader = staticconf.NamespaceReaders(config_namespace)
+        reader = get_namespace_reader(config_namespace)
         try:
             signal_name = reader.read_string('autoscale_signal.name')
         except ConfigurationError as e:
             raise NoSignalConfiguredException from e
         super().__init__(signal_name, cluster, pool, scheduler, app, config_namespace)
         self.required_metrics: list = reader.read_list('autoscale_signal.required_metrics', default=[])
+        self.metrics_query_threads = staticconf.read_int('autoscaling.metrics_query_threads', default=1)
+
+        # The required metrics don't change for the lifetime of the signal, so only build the queries once
+        self.metrics_queries = get_metrics_queries_for_signal(cluster, pool, scheduler, self.required_metrics)
 
         self.metrics_client: ClustermanMetricsBotoClient = metrics_client
         self.signal_namespace = signal_namespace
@@ -99,28 +105,29 @@ class ExternalSignal(Signal):
         :raises SignalConnectionError: if the signal connection fails for some reason
         """
         # Get the required metrics for the signal
-        metrics = get_metrics_for_signal(
-            self.cluster,
-            self.pool,
-            self.scheduler,
+        metrics = run_metrics_queries(
             self.app,
             self.metrics_client,
-            self.required_metrics,
+            self.metrics_queries,
             timestamp,
+            self.metrics_query_threads,
         )
 
         try:
             # First send the length of the metrics data
-            metric_bytes = json.dumps({'metrics': metrics, 'timestamp': timestamp.timestamp}).encode()
+            metric_bytes = orjson.dumps(
+                {'metrics': metrics, 'timestamp': timestamp.timestamp},
+                default=_json_default,
+            )
             len_metrics = struct.pack('>I', len(metric_bytes))  # bytes representation of the length, packed big-endian
-            self._signal_conn.send(len_metrics)
+            self._signal_conn.sendall(len_metrics)
             response = self._signal_conn.recv(SOCKET_MESG_SIZE)
             if response != ACK:
                 raise SignalConnectionError(f'Error occurred sending metric length to signal (response={response})')
 
-            # Then send the actual metrics data, broken up into chunks
-            for i in range(0, len(metric_bytes), SOCKET_MESG_SIZE):
-                self._signal_conn.send(metric_bytes[i:i + SOCKET_MESG_SIZE])
+            # Then send the actual metrics data; this is a stream socket, so let the kernel break it up (sendall also
+            # takes care of retrying any partial sends for us)
+            self._signal_conn.sendall(metric_bytes)
             response = self._signal_conn.recv(SOCKET_MESG_SIZE)
             ack_bit = response[:1]
             if ack_bit != ACK:
@@ -132,20 +139,23 @@ class ExternalSignal(Signal):
             response = response[1:] or self._signal_conn.recv(SOCKET_MESG_SIZE)
             logger.info(response)
 
-            return SignalResourceRequest(**json.loads(response)['Resources'])
+            return SignalResourceRequest(**orjson.loads(response)['Resources'])
 
-        except JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ClustermanSignalError('Signal evaluation failed') from e
         except BrokenPipeError as e:
             if retry_on_broken_pipe:
+                # _connect_to_signal_process retries (with backoff) until supervisord has restarted the signal, so we
+                # don't need to wait a fixed amount of time here before reconnecting
                 logger.error('Signal connection failed; reloading the signal and trying again')
-                time.sleep(5)  # give supervisord some time to restart the signal
                 self._signal_conn = self._connect_to_signal_process()
                 return self.evaluate(timestamp, retry_on_broken_pipe=False)
             else:
                 raise ClustermanSignalError('Signal evaluation failed') from e
 
-    @retry(exceptions=ConnectionRefusedError, tries=3, delay=5)  # retry signal connection in case it's slow to start
+    # Retry the signal connection in case it's slow to start; most signals come up quickly, so start out polling
+    # often and back off from there (this waits up to ~13s in total before giving up)
+    @retry(exceptions=ConnectionRefusedError, tries=7, delay=0.25, backoff=2, max_delay=5)
     def _connect_to_signal_process(self) -> socket.socket:
         """ Create a connection to the specified signal over a unix socket
 
@@ -153,15 +163,26 @@ class ExternalSignal(Signal):
         """
         # this creates an abstract namespace socket which is auto-cleaned on program exit
         signal_conn = socket.socket(socket.AF_UNIX)
+        # Nagle/keepalive tuning doesn't apply to Unix sockets, but we don't want a wedged signal process to be
+        # able to block the autoscaler forever either
+        signal_conn.settimeout(SOCKET_TIMEOUT_SECONDS)
         signal_conn.connect(f'\0{self.signal_namespace}-{self.name}-{self.app}-socket')
 
-        signal_kwargs = json.dumps({'parameters': self.parameters})
-        signal_conn.send(signal_kwargs.encode())
+        signal_kwargs = orjson.dumps({'parameters': self.parameters}, option=orjson.OPT_NON_STR_KEYS)
+        signal_conn.send(signal_kwargs)
         logger.info(f'Connected to signal {self.name} from {self.signal_namespace}')
 
         return signal_conn
 
 
+def _json_default(obj: Any) -> Any:
+    # metric values read back from DynamoDB are Decimals, which orjson doesn't know how to serialize; integral values
+    # (like timestamps) have to stay ints, so the signal sees the same JSON that it did when we used simplejson
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    raise TypeError
+
+
 def setup_signals_environment(pool: str, scheduler: str) -> Tuple[int, int]:
     app_namespace = POOL_NAMESPACE.format(pool=pool, scheduler=scheduler)
     signal_versions, signal_namespaces, signal_names, app_names = [], [], [], []
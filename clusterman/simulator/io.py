@@ -54,11 +54,13 @@ def _register_handlers():
 def read_object_from_compressed_json(filename, raw_timestamps=False):
     """ Read a Python object from a gzipped JSON file """
     _register_handlers()
-    with gzip.open(filename) as f:
+    # open in text mode so the file is decoded as it's decompressed, instead of building up the whole bytes object and
+    # then decoding a second copy of it
+    with gzip.open(filename, 'rt', encoding='utf-8') as f:
         if raw_timestamps:
             old_arrow = arrow.get
             arrow.get = int
-        data = jsonpickle.decode(f.read().decode())
+        data = jsonpickle.decode(f.read())
         if raw_timestamps:
             arrow.get = old_arrow
         return data
@@ -71,5 +73,5 @@ def write_object_to_compressed_json(obj, filename):
     :param filename: the file to write to
     """
     _register_handlers()
-    with gzip.open(filename, 'w') as f:
-        f.write(jsonpickle.encode(obj).encode())
+    with gzip.open(filename, 'wt', encoding='utf-8') as f:
+        f.write(jsonpickle.encode(obj))
@@ -11,8 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from collections import namedtuple
-from functools import lru_cache
 from typing import Iterable
 from uuid import uuid4
 
@@ -21,8 +19,6 @@ from clusterman.aws.markets import get_instance_market
 from clusterman.interfaces.types import ClusterNodeMetadata
 from clusterman.simulator.simulated_aws_cluster import SimulatedAWSCluster
 
-SpotMarketConfig = namedtuple('SpotMarketConfig', ['bid_price', 'weight'])
-
 
 class SimulatedSpotFleetResourceGroup(SimulatedAWSCluster, AWSResourceGroup):
     """ An implementation of a SimulatedAWSCluster designed to model the AWS EC2 Spot Fleet object, which is also a
@@ -69,11 +65,18 @@ class SimulatedSpotFleetResourceGroup(SimulatedAWSCluster, AWSResourceGroup):
         """
         SimulatedAWSCluster.__init__(self, simulator)
         AWSResourceGroup.__init__(self, f'ssfr-{uuid4()}')
-        self._instance_types = {}
+        # market_weight and the bid prices get looked up in all of the simulation's hot loops, so keep them in separate
+        # flat dicts rather than a dict of per-market config tuples
+        self._bid_prices = {}
+        self._weights = {}
         for spec in config['LaunchSpecifications']:
-            bid_price = float(spec['SpotPrice']) * spec['WeightedCapacity']
             market = get_instance_market(spec)
-            self._instance_types[market] = SpotMarketConfig(bid_price, spec['WeightedCapacity'])
+            self._bid_prices[market] = float(spec['SpotPrice']) * spec['WeightedCapacity']
+            self._weights[market] = spec['WeightedCapacity']
+
+        # market_capacities and fulfilled_capacity are read several times per simulation step, so keep track of the
+        # per-market capacities as instances are added and removed instead of recomputing them from every market
+        self._market_capacities = {}
 
         self.__target_capacity = 0
         self.allocation_strategy = config['AllocationStrategy']
@@ -81,7 +84,12 @@ class SimulatedSpotFleetResourceGroup(SimulatedAWSCluster, AWSResourceGroup):
             raise NotImplementedError(f'{self.allocation_strategy} not supported')
 
     def market_weight(self, market):
-        return self._instance_types[market].weight
+        return self._weights[market]
+
+    def modify_size(self, instances_by_market):
+        added_instances, removed_instances = super().modify_size(instances_by_market)
+        self._update_market_capacities(instance.market for instance in added_instances + removed_instances)
+        return added_instances, removed_instances
 
     def modify_target_capacity(self, target_capacity, *, dry_run=False):
         """ Modify the requested capacity for a particular spot fleet
@@ -102,9 +110,12 @@ class SimulatedSpotFleetResourceGroup(SimulatedAWSCluster, AWSResourceGroup):
         :param ids: desired ids of instances to be terminated
         :returns: a list of the terminated instance ids
         """
+        terminated_markets = set()
         for id in ids:
             self.simulator.remove_instance(self.instances[id])
+            terminated_markets.add(self.instances[id].market)
         super().terminate_instances_by_id(ids, batch_size)
+        self._update_market_capacities(terminated_markets)
         # restore capacity if current capacity is less than target capacity
         if self.fulfilled_capacity < self.target_capacity:
             self._increase_capacity_to_target(self.target_capacity)
@@ -119,7 +130,7 @@ class SimulatedSpotFleetResourceGroup(SimulatedAWSCluster, AWSResourceGroup):
         new_market_counts = self._get_new_market_counts(target_capacity)
         added_instances, __ = self.modify_size(new_market_counts)
         for instance in added_instances:
-            instance.bid_price = self._instance_types[instance.market].bid_price
+            instance.bid_price = self._bid_prices[instance.market]
             self.simulator.add_instance(instance)
         return self.fulfilled_capacity
 
@@ -133,8 +144,10 @@ class SimulatedSpotFleetResourceGroup(SimulatedAWSCluster, AWSResourceGroup):
         if target_capacity < self.target_capacity:
             raise ValueError(f'Target capacity {target_capacity} < current capacity {self.target_capacity}')
 
-        available_markets = self._find_available_markets()
-        residuals = self._compute_market_residuals(target_capacity, available_markets)
+        # Look up the current spot prices once, and share them between finding the available markets and sorting them
+        market_prices = self._get_market_prices()
+        available_markets = self._find_available_markets(market_prices)
+        residuals = self._compute_market_residuals(target_capacity, available_markets, market_prices)
 
         residual_correction = 0  # If we overflow in one market, correct the residuals in the remaining markets
         new_market_counts = {
@@ -142,8 +155,9 @@ class SimulatedSpotFleetResourceGroup(SimulatedAWSCluster, AWSResourceGroup):
             for market, ids in self.instance_ids_by_market.items()
         }
 
+        num_markets = len(residuals)
         for i, (market, residual) in enumerate(residuals):
-            remaining_markets = len(residuals) - (i + 1)
+            remaining_markets = num_markets - (i + 1)
 
             # If the residual correction is larger than the residual, this means we shouldn't add any more instances
             # in this market because its residual has been "eaten up" by overflow in previous markets.  When this
@@ -156,7 +170,7 @@ class SimulatedSpotFleetResourceGroup(SimulatedAWSCluster, AWSResourceGroup):
                 continue
 
             residual -= residual_correction
-            weight = self._instance_types[market].weight
+            weight = self._weights[market]
             instance_num, remainder = divmod(residual, weight)
 
             # If the instance weight doesn't evenly divide the residual, add an extra instance (which will
@@ -170,46 +184,75 @@ class SimulatedSpotFleetResourceGroup(SimulatedAWSCluster, AWSResourceGroup):
                     residual_correction += overflow / remaining_markets
 
             if instance_num != 0:
-                new_market_counts[market] = instance_num + self.market_size(market)
+                new_market_counts[market] = instance_num + new_market_counts.get(market, 0)
         return new_market_counts
 
-    def _compute_market_residuals(self, target_capacity, markets):
+    def _compute_market_residuals(self, target_capacity, markets, market_prices=None):
         """ Given a target capacity and list of available markets, compute the residuals needed to bring all markets up
         to an (approximately) equal capacity such that the total capacity meets or exceeds the target capacity
 
         :param target_capacity: the desired total capacity of the fleet
         :param markets: a list of available markets
+        :param market_prices: the current spot price in each market (looked up if not provided)
         :returns: a list of (market, residual) tuples, sorted first by lowest capacity and next by lowest spot price
         """
         target_capacity_per_market = target_capacity / len(markets) if len(markets) != 0 else 0
+        if market_prices is None:
+            market_prices = self._get_market_prices(markets)
+
+        # Look up the current capacities once up front, rather than on every comparison in the sort
+        market_capacities = self.market_capacities
+        residuals = [
+            (market, target_capacity_per_market - market_capacities.get(market, 0), market_prices[market])
+            for market in markets
+        ]
+        residuals.sort(key=lambda value_tuple: value_tuple[1:])
+        return [(market, residual) for market, residual, __ in residuals]
 
-        # Some helper closures for computing residuals and sorting;
-        @lru_cache()  # memoize the results
-        def residual(market):
-            return target_capacity_per_market - self.market_capacities.get(market, 0)
-
-        def residual_sort_key(value_tuple):
-            market, residual = value_tuple
-            return (residual, self.simulator.instance_prices[market].call(self.simulator.current_time))
+    def _update_market_capacities(self, markets):
+        """ Recompute the cached capacities for markets that have had instances added or removed
 
-        return sorted(
-            [(market, residual(market)) for market in markets],
-            key=residual_sort_key,
-        )
+        :param markets: an iterable of markets whose sizes may have changed
+        """
+        for market in set(markets):
+            if not market.az:
+                continue
+            # compute this from the market size rather than adding/subtracting weights so rounding errors don't build up
+            market_size = len(self.instance_ids_by_market.get(market, []))
+            if market_size:
+                self._market_capacities[market] = market_size * self._weights[market]
+            else:
+                self._market_capacities.pop(market, None)
 
     def _reload_resource_group(self):
         pass  # don't need to do anything here
 
-    def _find_available_markets(self):
+    def _get_market_prices(self, markets=None):
+        """
+        :param markets: the markets to look up prices for (defaults to all the markets in the spot fleet request)
+        :returns: a dict of market -> current spot price
         """
+        now = self.simulator.current_time
+        instance_prices = self.simulator.instance_prices
+        return {
+            market: instance_prices[market].call(now)
+            for market in (self._bid_prices if markets is None else markets)
+        }
+
+    def _find_available_markets(self, market_prices=None):
+        """
+        :param market_prices: the current spot price in each market (looked up if not provided)
         :returns: a list of available spot markets, e.g. markets in the spot fleet request whose bid price is above the
             current market price
         """
+        if market_prices is None:
+            market_prices = self._get_market_prices()
+
         # TODO (CLUSTERMAN-51) need to factor in on-demand prices here
         return [
             market
-            for market, config in self._instance_types.items()
-            if config.bid_price >= self.simulator.instance_prices[market].call(self.simulator.current_time)
+            for market, bid_price in self._bid_prices.items()
+            if bid_price >= market_prices[market]
         ]
 
     def _get_resource_group_tags(self):
@@ -221,11 +264,7 @@ class SimulatedSpotFleetResourceGroup(SimulatedAWSCluster, AWSResourceGroup):
 
     @property
     def market_capacities(self):
-        return {
-            market: len(instance_ids) * self.market_weight(market)
-            for market, instance_ids in self.instance_ids_by_market.items()
-            if market.az
-        }
+        return self._market_capacities
 
     @property
     def _target_capacity(self):
@@ -238,7 +277,7 @@ class SimulatedSpotFleetResourceGroup(SimulatedAWSCluster, AWSResourceGroup):
         Note that the actual capacity may be greater than the target capacity if instance weights do not evenly divide
         the given target capacity
         """
-        return sum(self.market_capacities.values())
+        return sum(self._market_capacities.values())
 
     @property
     def status(self):
@@ -47,6 +47,12 @@ from clusterman.simulator.util import patch_join_delay
 from clusterman.simulator.util import SimulationMetadata
 from clusterman.util import get_cluster_dimensions
 
+try:
+    # the libyaml-backed loader is much faster than the pure-python one, so use it if it's available
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore
+
 
 logger = colorlog.getLogger(__name__)
 SimFn = PiecewiseConstantFunction[Arrow]
@@ -260,13 +266,20 @@ class Simulator:
         if endpoint_url:
             env['AWS_ENDPOINT_URL_ARGS'] = f'--endpoint-url {endpoint_url}'
 
-        for i in range(fetch_count):
-            subprocess.run(['fetch_clusterman_signal', str(i), signal_dir], check=True, env=env)
+        # Each version is fetched into its own directory, so (like supervisord does in production) download them all
+        # at once and then wait for the whole group, rather than fetching them one at a time
+        fetch_procs = [
+            subprocess.Popen(['fetch_clusterman_signal', str(i), signal_dir], env=env)
+            for i in range(fetch_count)
+        ]
+        for proc in fetch_procs:
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, proc.args)
         for i in range(signal_count):
             subprocess.Popen(['run_clusterman_signal', str(i), signal_dir], env=env)
 
         with open(autoscaler_config_file) as f:
-            autoscaler_config = yaml.safe_load(f)
+            autoscaler_config = yaml.load(f, Loader=SafeLoader)
         configs = autoscaler_config.get('configs', [])
         if 'sfrs' in autoscaler_config:
             aws_configs = ec2.describe_spot_fleet_requests(SpotFleetRequestIds=autoscaler_config['sfrs'])
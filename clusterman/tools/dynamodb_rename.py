@@ -52,7 +52,7 @@ def print_progress(iteration, total, prefix='', suffix='', decimals=1, bar_lengt
 
 def main(args):
     with open(args.mapping_file) as f:
-        for line in f.readlines():
+        for line in f:
             old, new = line.split()
             table_name = f'clusterman_{args.metric_type}'
             query = dynamodb.get_paginator('query')
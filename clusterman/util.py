@@ -20,15 +20,18 @@ from enum import Enum
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import NamedTuple
 from typing import Optional
+from typing import Tuple
 from typing import TypeVar
 
 import arrow
 import colorlog
 import parsedatetime
 import staticconf
+from cachetools.func import ttl_cache
 from colorama import Fore
 from colorama import Style
 from staticconf.config import DEFAULT as DEFAULT_NAMESPACE
@@ -44,6 +47,7 @@ logger = colorlog.getLogger(__name__)
 CLUSTERMAN_STATE_TABLE = 'clusterman_cluster_state'
 AUTOSCALER_PAUSED = 'autoscaler_paused'
 DEFAULT_VOLUME_SIZE_GB = 300
+POOL_NAME_LIST_CACHE_SECONDS = 60
 
 
 # These should stay in sync with
@@ -121,6 +125,17 @@ def add_maybe_none(f1: Optional[float], f2: Optional[float]) -> Optional[float]:
         return f1 + f2
 
 
+def sum_resources(resources: Iterable[ClustermanResources]) -> ClustermanResources:
+    """ Add up each field of the given resources; ClustermanResources is a tuple, so + would concatenate them """
+    cpus, mem, disk, gpus = 0.0, 0.0, 0.0, 0.0
+    for r in resources:
+        cpus += r.cpus
+        mem += r.mem
+        disk += r.disk
+        gpus += r.gpus
+    return ClustermanResources(cpus=cpus, mem=mem, disk=disk, gpus=gpus)
+
+
 def setup_logging(log_level_str: str = 'info') -> None:
     EVENT_LOG_LEVEL = 25
     logging.addLevelName(EVENT_LOG_LEVEL, 'EVENT')
@@ -163,7 +178,8 @@ _T = TypeVar('_T')
 
 
 def any_of(*choices) -> Callable[[_T], bool]:
-    return lambda x: x in choices
+    choice_set = frozenset(choices)
+    return lambda x: x in choice_set
 
 
 def ask_for_confirmation(prompt='Are you sure? ', default=True):
@@ -358,12 +374,19 @@ def read_int_or_inf(reader, param):
     return float('inf') if reader.read_string(param, default=0) == 'inf' else reader.read_int(param, default=0)
 
 
-def get_pool_name_list(cluster_name: str, scheduler: str) -> List[str]:
+@ttl_cache(ttl=POOL_NAME_LIST_CACHE_SECONDS)
+def get_pool_name_list(cluster_name: str, scheduler: str) -> Tuple[str, ...]:
+    """ List the pools configured for a cluster; the cluster config directory only changes when pools are added or
+    removed, so this gets cached for a short time to avoid re-reading the directory every time we need the list.
+    Every caller gets the same cached result, so it's returned as a tuple to keep callers from modifying it.
+    """
     cluster_config_directory = get_cluster_config_directory(cluster_name)
-    return [
-        os.path.splitext(f)[0] for f in os.listdir(cluster_config_directory)
-        if f[0] != '.' and f.endswith(scheduler)  # skip dotfiles and only read scheduler files
-    ]
+    with os.scandir(cluster_config_directory) as entries:
+        return tuple(
+            os.path.splitext(entry.name)[0] for entry in entries
+            # skip dotfiles and only read scheduler files
+            if not entry.name.startswith('.') and entry.name.endswith(scheduler) and entry.is_file()
+        )
 
 
 def get_cluster_name_list(config_namespace: str = DEFAULT_NAMESPACE) -> List[str]:
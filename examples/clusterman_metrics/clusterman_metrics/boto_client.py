@@ -331,6 +331,7 @@ class ClustermanMetricsBotoClient(object):
     ) -> Set[str]:
         """ Query the global secondary index for any keys matching the metric query """
         metric_keys: Set[str] = set()
+        metric_re = re.compile(metric_query)
 
         for i in range(_GSI_PARTITIONS):
             query_condition = Key(GSI_PK).eq(i) & Key(GSI_SORT).between(
@@ -343,7 +344,7 @@ class ClustermanMetricsBotoClient(object):
             )
             metric_keys |= {
                 item['key'] for item in response['Items']
-                if re.search(metric_query, item['key'])
+                if metric_re.search(item['key'])
             }
 
         return metric_keys
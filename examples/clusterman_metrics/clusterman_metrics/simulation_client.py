@@ -103,11 +103,13 @@ class ClustermanMetricsSimulationClient(ClustermanMetricsBotoClient):
         extra_dimensions: Optional[Mapping[str, str]] = None,
     ) -> MetricsValuesDict:
         metrics: MetricsValuesDict = defaultdict(list)
+        generated_metrics = self.generated_metrics.get(metric_type, {})
         if is_regex:
+            metric_re = re.compile(metric_query)
             generated_keys = {
                 key_prefix + metric_key
-                for metric_key in self.generated_metrics.get(metric_type, {})
-                if re.search(metric_query, metric_key)
+                for metric_key in generated_metrics
+                if metric_re.search(metric_key)
             }
         else:
             generated_keys = {key_prefix + metric_query}
@@ -115,7 +117,7 @@ class ClustermanMetricsSimulationClient(ClustermanMetricsBotoClient):
         for metric_key in generated_keys:
             full_query_key = generate_key_with_dimensions(metric_key, extra_dimensions)
             try:
-                full_timeseries = self.generated_metrics.get(metric_type, {})[full_query_key]
+                full_timeseries = generated_metrics[full_query_key]
             except KeyError:
                 continue
 
@@ -80,7 +80,7 @@ def autoscaler_patches(context):
     ), mock.patch(
         'clusterman.signals.external_signal.ExternalSignal._connect_to_signal_process',
     ), mock.patch(
-        'clusterman.signals.external_signal.get_metrics_for_signal',
+        'clusterman.signals.external_signal.run_metrics_queries',
     ) as mock_metrics, mock_dynamodb2():
         dynamodb.create_table(
             TableName=CLUSTERMAN_STATE_TABLE,
@@ -344,7 +344,8 @@ def signal_resource_request(context, value):
     else:
         n, t = value.split(' ')
         resources = '{"' + t + '":' + n + '}'
-    context.autoscaler.signal._signal_conn.recv.side_effect = [ACK, ACK, '{"Resources": ' + resources + '}'] * 2
+    response = ('{"Resources": ' + resources + '}').encode()
+    context.autoscaler.signal._signal_conn.recv.side_effect = [ACK, ACK, response] * 2
 
 
 @behave.when('the autoscaler runs')
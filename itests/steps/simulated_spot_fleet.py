@@ -142,7 +142,7 @@ def market_high_capacity(context):
 def check_diversification(context):
     for market in _MARKETS:
         assert_that(
-            context.spot_fleet.market_size(market) * (context.spot_fleet._instance_types[market].weight),
+            context.spot_fleet.market_size(market) * context.spot_fleet.market_weight(market),
             close_to(context.desired_target_capacity / len(_MARKETS), 5.0),
         )
 
@@ -22,7 +22,10 @@ from clusterman.autoscaler.autoscaler import Autoscaler
 from clusterman.autoscaler.config import AutoscalingConfig
 from clusterman.config import POOL_NAMESPACE
 from clusterman.exceptions import NoSignalConfiguredException
+from clusterman.monitoring_lib import AsyncGauge
 from clusterman.monitoring_lib import GaugeProtocol
+from clusterman.monitoring_lib import LogMonitoringClient
+from clusterman.monitoring_lib import SignalFXMonitoringClient
 from clusterman.util import ClustermanResources
 from clusterman.util import SignalResourceRequest
 
@@ -108,6 +111,33 @@ def test_autoscaler_init_too_many_apps():
         Autoscaler('mesos-test', 'bar', 'mesos', ['app1', 'app2'], monitoring_enabled=False)
 
 
+@pytest.mark.parametrize('monitoring_client,monitoring_enabled,expect_async', [
+    (SignalFXMonitoringClient, True, True),
+    (SignalFXMonitoringClient, False, False),
+    (LogMonitoringClient, True, False),
+])
+def test_autoscaler_init_async_gauges(monitoring_client, monitoring_enabled, expect_async):
+    with mock.patch(
+        'clusterman.autoscaler.autoscaler.ClustermanMetricsBotoClient',
+        autospec=True,
+    ), mock.patch(
+        'clusterman.autoscaler.autoscaler.PoolManager',
+        autospec=True,
+    ), mock.patch(
+        'clusterman.autoscaler.autoscaler.Autoscaler._get_signal_for_app',
+        autospec=True,
+    ), mock.patch(
+        'clusterman.autoscaler.autoscaler.get_monitoring_client',
+        return_value=monitoring_client,
+    ), mock.patch(
+        'clusterman.autoscaler.autoscaler.ExternalSignal',
+    ), mock.patch.object(monitoring_client, 'create_gauge'):
+        autoscaler = Autoscaler('mesos-test', 'bar', 'mesos', ['bar'], monitoring_enabled=monitoring_enabled)
+
+    gauges = [autoscaler.target_capacity_gauge, *autoscaler.resource_request_gauges.values()]
+    assert all(isinstance(gauge, AsyncGauge) == expect_async for gauge in gauges)
+
+
 @mock.patch('clusterman.autoscaler.autoscaler.ExternalSignal')
 @pytest.mark.parametrize('monitoring_enabled', [True, False])
 def test_monitoring_enabled(mock_signal, mock_autoscaler, monitoring_enabled):
@@ -138,6 +168,10 @@ def test_run_interval_seconds(mock_autoscaler):
     mock_autoscaler.signal.period_minutes = 7
     assert mock_autoscaler.run_frequency == 7 * 60
 
+    # the run frequency is cached after the first lookup
+    mock_autoscaler.signal.period_minutes = 10
+    assert mock_autoscaler.run_frequency == 7 * 60
+
 
 @pytest.mark.parametrize('dry_run', [True, False])
 def test_autoscaler_run(dry_run, mock_autoscaler, run_timestamp):
@@ -163,6 +197,20 @@ def test_autoscaler_run(dry_run, mock_autoscaler, run_timestamp):
     assert mock_autoscaler.resource_request_gauges['disk'].set.call_count == 0
 
 
+def test_autoscaler_run_logs_signal_exception(mock_autoscaler, mock_logger, run_timestamp):
+    mock_autoscaler._compute_target_capacity = mock.Mock(return_value=100)
+    signal_exception = ValueError('foo')
+    mock_autoscaler.signal.evaluate.side_effect = signal_exception
+    mock_autoscaler.default_signal.evaluate.return_value = SignalResourceRequest(cpus=100)
+    with mock.patch(
+        'clusterman.autoscaler.autoscaler.autoscaling_is_paused',
+        return_value=False,
+    ), pytest.raises(ValueError):
+        mock_autoscaler.run(timestamp=run_timestamp)
+
+    assert mock_logger.error.call_args == mock.call('The client signal failed with:', exc_info=signal_exception)
+
+
 def test_autoscaler_run_paused(mock_autoscaler, run_timestamp):
     mock_autoscaler._compute_target_capacity = mock.Mock(return_value=100)
     mock_autoscaler._is_paused = mock.Mock(return_value=True)
@@ -331,3 +379,19 @@ def test_get_smoothed_non_zero_metadata_all_zero(mock_autoscaler):
         'some_metric': [(Decimal('150'), Decimal('0')), (Decimal('160'), Decimal('0')), (Decimal('170'), Decimal('0'))],
     }
     assert mock_autoscaler._get_smoothed_non_zero_metadata('some_metric', 0, 200, smoothing=3) is None
+
+
+def test_compute_target_capacity_info_logging_disabled(mock_autoscaler, mock_logger):
+    mock_logger.reset_mock()
+    mock_logger.isEnabledFor.return_value = False
+    mock_autoscaler.pool_manager.target_capacity = 125
+    mock_autoscaler.pool_manager.non_orphan_fulfilled_capacity = 125
+    mock_autoscaler.pool_manager.cluster_connector.get_cluster_total_resources.return_value = ClustermanResources(
+        cpus=1000, mem=1000, disk=1000, gpus=1000,
+    )
+    assert mock_autoscaler._compute_target_capacity(SignalResourceRequest(cpus=980)) == pytest.approx(175)
+    assert mock_logger.info.call_args_list == []
+
+
+def test_pool_namespace(mock_autoscaler):
+    assert mock_autoscaler.pool_namespace == POOL_NAMESPACE.format(pool='bar', scheduler='mesos')
@@ -547,3 +547,17 @@ def test_instance_kill_order(mock_pool_manager):
     killable_nodes = mock_pool_manager._get_prioritized_killable_nodes()
     killable_instance_ids = [node_metadata.instance.instance_id for node_metadata in killable_nodes]
     assert killable_instance_ids == [f'i-{i}' for i in range(8)]
+
+
+def test_get_node_metadatas_preserves_group_order(mock_pool_manager, mock_resource_groups):
+    for group_id, group in mock_resource_groups.items():
+        group.get_instance_metadatas.return_value = [
+            _make_metadata(group_id, f'{group_id}-{i}').instance for i in range(2)
+        ]
+
+    node_metadatas = mock_pool_manager.get_node_metadatas(('running',))
+    assert [node_metadata.instance.instance_id for node_metadata in node_metadatas] == [
+        f'sfr-{i}-{j}' for i in range(7) for j in range(2)
+    ]
+    for group in mock_resource_groups.values():
+        assert group.get_instance_metadatas.call_args == mock.call(('running',))
@@ -114,6 +114,18 @@ def test_mark_stale(mock_asrg, dry_run):
             assert len(stale_tags) == 1
 
 
+def test_mark_stale_batches(mock_asrg):
+    with mock.patch('clusterman.aws.auto_scaling_resource_group._BATCH_MODIFY_SIZE', 3), mock.patch(
+        'clusterman.aws.auto_scaling_resource_group.ec2.create_tags',
+        wraps=ec2.create_tags,
+    ) as mock_create_tags:
+        mock_asrg.mark_stale(dry_run=False)
+
+    tagged_batches = [call[1]['Resources'] for call in mock_create_tags.call_args_list]
+    assert sorted(len(batch) for batch in tagged_batches) == [1, 3, 3, 3]
+    assert sorted(sum(tagged_batches, [])) == sorted(mock_asrg.instance_ids)
+
+
 @pytest.mark.parametrize('stale_instances', [0, 7])
 def test_modify_target_capacity_up(mock_asrg, stale_instances):
     new_desired_capacity = mock_asrg.target_capacity + 5
@@ -262,3 +274,44 @@ def test_get_asg_tags(mock_asrg, mock_asg_config):
     tags = asg_id_to_tags[mock_asg_config['AutoScalingGroupName']]
     assert 'fake_tag_key' in tags
     assert tags['fake_tag_key'] == 'fake_tag_value'
+
+
+def test_load_uses_described_configs(mock_asg_config, mock_cluster, mock_pool):
+    AutoScalingResourceGroup._get_resource_group_tags.cache_clear()
+    with mock.patch(
+        'clusterman.aws.auto_scaling_resource_group.autoscaling.describe_auto_scaling_groups',
+        wraps=autoscaling.describe_auto_scaling_groups,
+    ) as mock_describe:
+        asrgs = AutoScalingResourceGroup.load(mock_cluster, mock_pool, {'tag': 'puppet:role::paasta'})
+        assert list(asrgs) == [mock_asg_config['AutoScalingGroupName']]
+        assert mock_describe.call_count == 0
+
+        # the config passed in by load is only used once
+        asrgs[mock_asg_config['AutoScalingGroupName']]._reload_resource_group()
+        assert mock_describe.call_count == 1
+
+    assert asrgs[mock_asg_config['AutoScalingGroupName']].target_capacity == mock_asg_config['DesiredCapacity']
+
+
+@pytest.mark.parametrize('group_ids', [[], ['asg-1'], [f'asg-{i}' for i in range(60)]])
+def test_load_describes_only_matching_asgs(mock_cluster, mock_pool, group_ids):
+    with mock.patch(
+        'clusterman.aws.auto_scaling_resource_group.AutoScalingResourceGroup._get_matching_resource_group_ids',
+        return_value=group_ids,
+    ), mock.patch(
+        'clusterman.aws.auto_scaling_resource_group.autoscaling.get_paginator',
+    ) as mock_get_paginator, mock.patch(
+        'clusterman.aws.auto_scaling_resource_group.AutoScalingResourceGroup._load_resource_groups',
+    ) as mock_load_resource_groups:
+        mock_get_paginator.return_value.paginate.side_effect = lambda AutoScalingGroupNames: [
+            {'AutoScalingGroups': [{'AutoScalingGroupName': name} for name in AutoScalingGroupNames]},
+        ]
+        AutoScalingResourceGroup.load(mock_cluster, mock_pool, {'tag': 'puppet:role::paasta'})
+
+    assert mock_get_paginator.return_value.paginate.call_args_list == [
+        mock.call(AutoScalingGroupNames=group_ids[i:i + 50]) for i in range(0, len(group_ids), 50)
+    ]
+    assert mock_load_resource_groups.call_args == mock.call(
+        group_ids,
+        group_configs={name: {'AutoScalingGroupName': name} for name in group_ids},
+    )
@@ -19,6 +19,7 @@ import simplejson as json
 
 from clusterman.aws.aws_resource_group import AWSResourceGroup
 from clusterman.aws.client import ec2
+from clusterman.aws.client import ec2_describe_instances
 from clusterman.aws.markets import InstanceMarket
 from clusterman.interfaces.types import ClusterNodeMetadata
 
@@ -166,6 +167,19 @@ def test_terminate_instance_missing_subnet(mock_logger, mock_resource_group):
         assert 'missing AZ info' in msg[0][0]
 
 
+def test_terminate_instances_by_id_concurrent_batches(mock_resource_group):
+    instance_ids = mock_resource_group.instance_ids
+    with mock.patch(
+        'clusterman.aws.aws_resource_group.ec2.terminate_instances',
+        wraps=ec2.terminate_instances,
+    ) as mock_terminate:
+        terminated_ids = mock_resource_group.terminate_instances_by_id(instance_ids, batch_size=2)
+    batches = [c[1]['InstanceIds'] for c in mock_terminate.call_args_list]
+    assert sorted(len(batch) for batch in batches) == [1, 2, 2]
+    assert sorted(sum(batches, [])) == sorted(instance_ids)
+    assert sorted(terminated_ids) == sorted(instance_ids)
+
+
 def test_terminate_all_instances_by_id_small_batch(mock_resource_group):
     instance_ids = mock_resource_group.instance_ids
     with mock.patch(
@@ -193,6 +207,50 @@ def test_terminate_some_instances_missing(mock_logger, mock_resource_group):
         assert mock_logger.warning.call_count == 2
 
 
+@mock.patch('clusterman.aws.aws_resource_group.logger')
+def test_terminate_undescribed_instances(mock_logger, mock_resource_group):
+    instance_ids = mock_resource_group.instance_ids
+    with mock.patch(
+        'clusterman.aws.aws_resource_group.ec2_describe_instances',
+        side_effect=lambda ids: ec2_describe_instances([i for i in ids if i != instance_ids[0]]),
+    ):
+        terminated_ids = mock_resource_group.terminate_instances_by_id(instance_ids)
+
+    # instances we couldn't describe are still sent to AWS to be terminated
+    assert sorted(terminated_ids) == sorted(instance_ids)
+    assert mock_logger.warning.call_count == 0
+
+
+@mock.patch('clusterman.aws.aws_resource_group.logger')
+def test_terminate_instances_by_id_batch_failure(mock_logger, mock_resource_group):
+    instance_ids = mock_resource_group.instance_ids
+    orig_terminate_instances = ec2.terminate_instances
+    failed_batch = []
+
+    def terminate_instances(InstanceIds):
+        if instance_ids[0] in InstanceIds:
+            failed_batch.extend(InstanceIds)
+            raise ValueError('terminate failed')
+        return orig_terminate_instances(InstanceIds=InstanceIds)
+
+    with mock.patch('clusterman.aws.aws_resource_group.ec2.terminate_instances', side_effect=terminate_instances):
+        terminated_ids = mock_resource_group.terminate_instances_by_id(instance_ids, batch_size=2)
+
+    # the other batches' terminations are still reported
+    assert failed_batch
+    assert sorted(terminated_ids) == sorted(set(instance_ids) - set(failed_batch))
+    assert mock_logger.exception.call_count == 1
+    assert str(failed_batch) in mock_logger.exception.call_args[0][0]
+
+
+def test_terminate_instances_by_id_all_batches_fail(mock_resource_group):
+    with mock.patch(
+        'clusterman.aws.aws_resource_group.ec2.terminate_instances',
+        side_effect=ValueError('terminate failed'),
+    ), pytest.raises(ValueError):
+        mock_resource_group.terminate_instances_by_id(mock_resource_group.instance_ids, batch_size=2)
+
+
 @mock.patch('clusterman.aws.aws_resource_group.logger')
 def test_terminate_no_instances_by_id(mock_logger, mock_resource_group):
     terminated_ids = mock_resource_group.terminate_instances_by_id([])
@@ -115,6 +115,32 @@ def test_load_spot_fleets_from_s3():
         assert {sfr_id for sfr_id in sfrgs} == {'sfr-1', 'sfr-2'}
 
 
+@mock_s3
+def test_load_spot_fleets_from_s3_skips_duplicates():
+    s3.create_bucket(Bucket='fake-clusterman-sfrs', CreateBucketConfiguration={'LocationConstraint': 'us-west-2'})
+    for key, sfr_id in [('sfr-1.json', 'sfr-1'), ('sfr-1-copy.json', 'sfr-1'), ('sfr-2.json', 'sfr-2')]:
+        s3.put_object(Bucket='fake-clusterman-sfrs', Key=f'fake-region/{key}', Body=json.dumps({
+            'cluster_autoscaling_resources': {
+                'aws_spot_fleet_request': {
+                    'id': sfr_id,
+                    'pool': 'my-pool'
+                }
+            }
+        }).encode())
+
+    with mock.patch(
+        'clusterman.aws.spot_fleet_resource_group.SpotFleetResourceGroup',
+    ) as mock_sfrg:
+        sfrgs = load_spot_fleets_from_s3(
+            bucket='fake-clusterman-sfrs',
+            prefix='fake-region',
+            pool='my-pool',
+            exclude_ids={'sfr-2'},
+        )
+        assert set(sfrgs) == {'sfr-1'}
+        assert mock_sfrg.call_args_list == [mock.call('sfr-1')]
+
+
 def test_load_spot_fleets():
     with mock.patch(
         'clusterman.aws.spot_fleet_resource_group.AWSResourceGroup.load',
@@ -135,6 +161,7 @@ def test_load_spot_fleets():
             },
         )
         assert {sf for sf in spot_fleets} == {'sfr-1', 'sfr-2', 'sfr-4'}
+        assert set(mock_s3_load.call_args[1]['exclude_ids']) == {'sfr-1', 'sfr-2'}
 
 
 def test_get_spot_fleet_request_tags(mock_sfr_response):
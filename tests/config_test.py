@@ -25,35 +25,44 @@ from clusterman.config import POOL_NAMESPACE
 from tests.conftest import mock_open
 
 
+# The pool config contents don't change between tests, so only serialize them once
+_POOL_CONFIG_CONTENTS = {
+    ('cluster-A', 'pool-1', 'mesos'): yaml.dump({
+        'resource_groups': 'cluster-A',
+        'other_config': 18,
+    }),
+    ('cluster-A', 'pool-2', 'mesos'): yaml.dump({
+        'resource_groups': 'cluster-A',
+        'other_config': 20,
+    }),
+    ('cluster-A', 'pool-2', 'kubernetes'): yaml.dump({
+        'resource_groups': 'cluster-A',
+        'other_config': 29,
+    }),
+    ('cluster-B', 'pool-1', 'mesos'): yaml.dump({
+        'resource_groups': 'cluster-B',
+        'other_config': 200,
+        'autoscale_signal': {'branch_or_tag': 'v42'},
+    }),
+}
+
+
 @pytest.fixture
 def mock_config_files():
     with staticconf.testing.PatchConfiguration(
         {'cluster_config_directory': '/nail/whatever'}
     ), mock_open(
         config.get_pool_config_path('cluster-A', 'pool-1', 'mesos'),
-        contents=yaml.dump({
-            'resource_groups': 'cluster-A',
-            'other_config': 18,
-        }),
+        contents=_POOL_CONFIG_CONTENTS['cluster-A', 'pool-1', 'mesos'],
     ), mock_open(
         config.get_pool_config_path('cluster-A', 'pool-2', 'mesos'),
-        contents=yaml.dump({
-            'resource_groups': 'cluster-A',
-            'other_config': 20,
-        }),
+        contents=_POOL_CONFIG_CONTENTS['cluster-A', 'pool-2', 'mesos'],
     ), mock_open(
         config.get_pool_config_path('cluster-A', 'pool-2', 'kubernetes'),
-        contents=yaml.dump({
-            'resource_groups': 'cluster-A',
-            'other_config': 29,
-        }),
+        contents=_POOL_CONFIG_CONTENTS['cluster-A', 'pool-2', 'kubernetes'],
     ), mock_open(
         config.get_pool_config_path('cluster-B', 'pool-1', 'mesos'),
-        contents=yaml.dump({
-            'resource_groups': 'cluster-B',
-            'other_config': 200,
-            'autoscale_signal': {'branch_or_tag': 'v42'},
-        }),
+        contents=_POOL_CONFIG_CONTENTS['cluster-B', 'pool-1', 'mesos'],
     ), mock_open(
         '/etc/no_cfg/clusterman.json',
         contents=json.dumps({
@@ -152,3 +161,10 @@ def test_load_cluster_pool_config(cluster, pool, pool_other_config, mock_config_
     pool_namespace = POOL_NAMESPACE.format(pool=pool, scheduler='mesos')
     assert staticconf.read_int('other_config', namespace=pool_namespace) == pool_other_config
     assert staticconf.read_string('resource_groups', namespace=pool_namespace) == cluster
+
+
+def test_get_namespace_reader():
+    reader = config.get_namespace_reader('bar.mesos_config')
+    assert reader is config.get_namespace_reader('bar.mesos_config')
+    with staticconf.testing.PatchConfiguration({'other_config': 42}, namespace='bar.mesos_config'):
+        assert reader.read_int('other_config') == 42
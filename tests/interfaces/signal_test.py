@@ -1,3 +1,5 @@
+import threading
+
 import arrow
 import mock
 import pytest
@@ -61,3 +63,52 @@ def test_get_metadata_metrics():
     with pytest.raises(MetricsError):
         required_metrics = [{'name': 'total_cpus', 'type': METADATA, 'minute_range': 10}]
         get_metrics_for_signal('foo', 'bar', 'mesos', 'app1', mock.Mock(), required_metrics, arrow.get(0))
+
+
+def test_get_metrics_duplicate_queries():
+    required_metrics = [
+        {'name': 'cost', 'type': APP_METRICS, 'minute_range': 30},
+        {'name': 'cost', 'type': APP_METRICS, 'minute_range': 30},
+    ]
+    metrics_client = mock.Mock()
+    metrics_client.get_metric_values.return_value = {'app1,cost': [(1, 2.5), (3, 4.5)]}
+    metrics = get_metrics_for_signal('foo', 'bar', 'mesos', 'app1', metrics_client, required_metrics, arrow.get(3600))
+    assert metrics_client.get_metric_values.call_count == 1
+    assert metrics == {'app1,cost': [(1, 2.5), (3, 4.5)]}
+
+
+def test_get_metrics_threaded():
+    required_metrics = [
+        {'name': 'cpus_allocated', 'type': SYSTEM_METRICS, 'minute_range': 10},
+        {'name': 'cost', 'type': APP_METRICS, 'minute_range': 30},
+    ]
+    metrics_client = mock.Mock()
+    metrics_client.get_metric_values.side_effect = lambda name, *args, **kwargs: {name: [(1, 2), (3, 4)]}
+    metrics = get_metrics_for_signal(
+        'foo', 'bar', 'mesos', 'app1', metrics_client, required_metrics, arrow.get(3600), max_workers=4,
+    )
+    assert metrics_client.get_metric_values.call_count == 3
+    assert metrics == {'cpus_allocated': [(1, 2), (1, 2), (3, 4), (3, 4)], 'cost': [(1, 2), (3, 4)]}
+
+
+def test_get_metrics_threaded_out_of_order():
+    required_metrics = [
+        {'name': 'cpus_allocated', 'type': SYSTEM_METRICS, 'minute_range': 10},
+        {'name': 'cost', 'type': APP_METRICS, 'minute_range': 30},
+    ]
+    cost_fetched = threading.Event()
+
+    def get_metric_values(name, *args, **kwargs):
+        # make the system metrics queries finish after the app metrics query
+        if name == 'cpus_allocated':
+            assert cost_fetched.wait(timeout=5)
+            return {name: [(3, 4)] if kwargs['extra_dimensions']['pool'] == 'bar' else [(1, 2)]}
+        cost_fetched.set()
+        return {name: [(1, 2), (3, 4)]}
+
+    metrics_client = mock.Mock()
+    metrics_client.get_metric_values.side_effect = get_metric_values
+    metrics = get_metrics_for_signal(
+        'foo', 'bar', 'mesos', 'app1', metrics_client, required_metrics, arrow.get(3600), max_workers=3,
+    )
+    assert metrics == {'cpus_allocated': [(1, 2), (3, 4)], 'cost': [(1, 2), (3, 4)]}
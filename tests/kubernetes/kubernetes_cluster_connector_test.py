@@ -37,6 +37,7 @@ from staticconf.testing import PatchConfiguration
 from clusterman.config import POOL_NAMESPACE
 from clusterman.interfaces.types import AgentState
 from clusterman.kubernetes.kubernetes_cluster_connector import KubernetesClusterConnector
+from clusterman.util import ClustermanResources
 
 
 @pytest.fixture
@@ -339,12 +340,25 @@ def test_allocation_with_excluded_pods(mock_cluster_connector, daemonset_pod):
         assert daemonset_pod not in mock_cluster_connector._pods_by_ip['10.10.10.2']
         assert mock_cluster_connector.get_resource_total('cpus') == 10
         assert mock_cluster_connector.get_resource_allocation('cpus') == 6
+        assert mock_cluster_connector.get_cluster_total_resources().cpus == 10
+        assert mock_cluster_connector.get_cluster_allocated_resources().cpus == 6
 
 
 def test_total_cpus(mock_cluster_connector):
     assert mock_cluster_connector.get_resource_total('cpus') == 11.5
 
 
+def test_cluster_resources(mock_cluster_connector):
+    assert mock_cluster_connector.get_cluster_total_resources() == ClustermanResources(**{
+        resource: mock_cluster_connector.get_resource_total(resource)
+        for resource in ClustermanResources._fields
+    })
+    assert mock_cluster_connector.get_cluster_allocated_resources() == ClustermanResources(**{
+        resource: mock_cluster_connector.get_resource_allocation(resource)
+        for resource in ClustermanResources._fields
+    })
+
+
 def test_get_unschedulable_pods(mock_cluster_connector):
     assert len(mock_cluster_connector.get_unschedulable_pods()) == 1
 
@@ -18,6 +18,7 @@ from clusterman.exceptions import PoolManagerError
 from clusterman.interfaces.types import AgentState
 from clusterman.mesos.mesos_cluster_connector import MesosClusterConnector
 from clusterman.mesos.mesos_cluster_connector import TaskCount
+from clusterman.util import ClustermanResources
 
 
 @pytest.fixture
@@ -56,6 +57,11 @@ def test_get_agent_metadata(mock_cluster_connector, ip_address, expected_state):
     assert agent_metadata.state == expected_state
 
 
+def test_get_cluster_resources(mock_cluster_connector):
+    assert mock_cluster_connector.get_cluster_total_resources() == ClustermanResources(cpus=12, gpus=2)
+    assert mock_cluster_connector.get_cluster_allocated_resources() == ClustermanResources(cpus=1.5)
+
+
 def test_count_tasks_by_agent(mock_cluster_connector):
     mock_cluster_connector._tasks = [
         {'slave_id': '1', 'state': 'TASK_RUNNING', 'framework_id': '2'},
@@ -108,3 +114,16 @@ def test_total_cpus(mock_cluster_connector):
 @pytest.mark.parametrize('resource_name,expected', [('mem', 0), ('cpus', 0.125)])
 def test_average_allocation(mock_cluster_connector, resource_name, expected):
     assert mock_cluster_connector.get_percent_resource_allocation(resource_name) == expected
+
+
+def test_cluster_resources_recomputed_on_reload(mock_cluster_connector):
+    assert mock_cluster_connector.get_resource_total('cpus') == 12
+    assert mock_cluster_connector.get_resource_total('gpus') == 2
+
+    new_agents = {'10.10.10.3': {'id': 'new', 'resources': {'cpus': 2}, 'used_resources': {'cpus': 1}}}
+    with mock.patch.object(mock_cluster_connector, '_get_agents_by_ip', return_value=new_agents), \
+            mock.patch.object(mock_cluster_connector, '_get_tasks_and_frameworks', return_value=([], {})):
+        mock_cluster_connector.reload_state()
+
+    assert mock_cluster_connector.get_cluster_total_resources() == ClustermanResources(cpus=2)
+    assert mock_cluster_connector.get_resource_allocation('cpus') == 1
@@ -15,6 +15,7 @@ import mock
 import pytest
 
 from clusterman.exceptions import PoolConnectionError
+from clusterman.mesos.util import _get_mesos_master_url
 from clusterman.mesos.util import agent_pid_to_ip
 from clusterman.mesos.util import allocated_agent_resources
 from clusterman.mesos.util import mesos_post
@@ -46,8 +47,14 @@ def test_allocated_agent_resources(mock_agents_response):
 
 @mock.patch('clusterman.mesos.util.mesos_post', wraps=mesos_post)
 class TestMesosPost:
+    @pytest.fixture(autouse=True)
+    def clear_master_url_cache(self):
+        _get_mesos_master_url.cache_clear()
+        yield
+        _get_mesos_master_url.cache_clear()
+
     def test_success(self, wrapped_post):
-        with mock.patch('clusterman.mesos.util.requests'):
+        with mock.patch('clusterman.mesos.util._MESOS_SESSION'):
             wrapped_post('http://the.mesos.master/', 'an-endpoint')
         assert wrapped_post.call_count == 2
         assert wrapped_post.call_args_list == [
@@ -55,8 +62,23 @@ class TestMesosPost:
             mock.call('http://the.mesos.master/', 'redirect'),
         ]
 
+    def test_caches_master_url(self, wrapped_post):
+        with mock.patch('clusterman.mesos.util._MESOS_SESSION') as mock_session:
+            wrapped_post('http://the.mesos.master/', 'an-endpoint')
+            wrapped_post('http://the.mesos.master/', 'another-endpoint')
+        assert wrapped_post.call_count == 3
+        assert mock_session.post.call_count == 3
+
     def test_failure(self, wrapped_post):
-        with mock.patch('clusterman.mesos.util.requests') as mock_requests, \
+        with mock.patch('clusterman.mesos.util._MESOS_SESSION') as mock_session, \
                 pytest.raises(PoolConnectionError):
-            mock_requests.post.side_effect = Exception('something bad happened')
+            mock_session.post.side_effect = Exception('something bad happened')
+            wrapped_post('http://the.mesos.master/', 'an-endpoint')
+
+    def test_failure_clears_master_url(self, wrapped_post):
+        with mock.patch('clusterman.mesos.util._MESOS_SESSION') as mock_session:
             wrapped_post('http://the.mesos.master/', 'an-endpoint')
+            mock_session.post.return_value.raise_for_status.side_effect = Exception('something bad happened')
+            with pytest.raises(PoolConnectionError):
+                wrapped_post('http://the.mesos.master/', 'an-endpoint')
+        assert _get_mesos_master_url.cache_info().currsize == 0
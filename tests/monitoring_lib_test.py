@@ -14,6 +14,8 @@
 import mock
 import pytest
 
+from clusterman.monitoring_lib import _get_async_emitter_queue
+from clusterman.monitoring_lib import AsyncGauge
 from clusterman.monitoring_lib import get_monitoring_client
 from clusterman.monitoring_lib import LogMonitoringClient
 from clusterman.monitoring_lib import SignalFXMonitoringClient
@@ -23,3 +25,36 @@ from clusterman.monitoring_lib import SignalFXMonitoringClient
 def test_default_monitoring_client(ym):
     with mock.patch('clusterman.monitoring_lib.yelp_meteorite', ym):
         assert get_monitoring_client() == (LogMonitoringClient if not ym else SignalFXMonitoringClient)
+
+
+def test_async_gauge():
+    gauge = mock.Mock()
+    AsyncGauge(gauge).set(42, {'dry_run': True})
+    _get_async_emitter_queue().join()
+    assert gauge.set.call_args == mock.call(42, {'dry_run': True})
+
+
+def test_async_gauge_emitter_error():
+    gauge = mock.Mock()
+    gauge.set.side_effect = [ValueError, None]
+    async_gauge = AsyncGauge(gauge)
+    async_gauge.set(1)
+    async_gauge.set(2)
+    _get_async_emitter_queue().join()
+    assert gauge.set.call_count == 2
+
+
+def test_async_gauge_queue_full():
+    gauge = mock.Mock()
+    with mock.patch('clusterman.monitoring_lib._get_async_emitter_queue') as mock_get_queue:
+        AsyncGauge(gauge).set(42)
+    # a full queue should apply backpressure instead of dropping the value
+    assert mock_get_queue.return_value.put.call_args == mock.call((gauge, 42, (), {}))
+
+
+def test_async_emitter_queue_flushed_at_exit():
+    with mock.patch('clusterman.monitoring_lib._async_emitter_queue', None), \
+            mock.patch('clusterman.monitoring_lib.threading.Thread'), \
+            mock.patch('clusterman.monitoring_lib.atexit.register') as mock_register:
+        emitter_queue = _get_async_emitter_queue()
+    assert mock_register.call_args == mock.call(emitter_queue.join)
@@ -11,13 +11,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import math
 import os
+import struct
+from decimal import Decimal
 
 import arrow
 import mock
+import orjson
 import pytest
-import simplejson as json
 import staticconf
 
 from clusterman.exceptions import ClustermanSignalError
@@ -26,6 +27,7 @@ from clusterman.exceptions import SignalConnectionError
 from clusterman.signals.external_signal import ACK
 from clusterman.signals.external_signal import ExternalSignal
 from clusterman.signals.external_signal import setup_signals_environment
+from clusterman.signals.external_signal import SOCKET_TIMEOUT_SECONDS
 from clusterman.util import SignalResourceRequest
 
 
@@ -42,6 +44,14 @@ def test_init(mock_signal):
     assert mock_signal.parameters['pool'] == 'bar'
 
 
+def test_init_builds_metrics_queries(mock_signal):
+    assert [(q.name, q.type) for q in mock_signal.metrics_queries] == [
+        ('cpus_allocated', 'system_metrics'),
+        ('cpus_allocated', 'system_metrics'),
+        ('cost', 'app_metrics'),
+    ]
+
+
 def test_no_signal_configured():
     with staticconf.testing.MockConfiguration(
         {},
@@ -52,45 +62,63 @@ def test_no_signal_configured():
         return ExternalSignal('foo', 'bar', 'mesos', 'app1', 'bar.mesos_config', mock.Mock(), 'the_signal')
 
 
+def test_connect_to_signal_process(mock_signal):
+    with mock.patch('clusterman.signals.external_signal.socket.socket') as mock_socket:
+        signal_conn = mock_signal._connect_to_signal_process()
+    assert signal_conn == mock_socket.return_value
+    assert signal_conn.settimeout.call_args == mock.call(SOCKET_TIMEOUT_SECONDS)
+    assert signal_conn.connect.call_args == mock.call('\0the_signal-BarSignal3-app1-socket')
+    assert orjson.loads(signal_conn.send.call_args[0][0]) == {'parameters': mock_signal.parameters}
+
+
+def test_connect_to_signal_process_waits_for_signal(mock_signal):
+    with mock.patch('clusterman.signals.external_signal.socket.socket') as mock_socket, \
+            mock.patch('time.sleep') as mock_sleep:
+        mock_socket.return_value.connect.side_effect = [ConnectionRefusedError, ConnectionRefusedError, None]
+        signal_conn = mock_signal._connect_to_signal_process()
+    assert signal_conn.connect.call_count == 3
+    assert mock_sleep.call_args_list == [mock.call(0.25), mock.call(0.5)]
+
+
 @pytest.mark.parametrize('conn_response', [['foo'], [ACK, 'foo']])
 def test_evaluate_signal_connection_errors(mock_signal, conn_response):
     mock_signal._signal_conn.recv.side_effect = conn_response
     with mock.patch(
-        'clusterman.signals.external_signal.get_metrics_for_signal', return_value={}
+        'clusterman.signals.external_signal.run_metrics_queries', return_value={}
     ), pytest.raises(SignalConnectionError):
         mock_signal.evaluate(arrow.get(12345678))
-    assert mock_signal._signal_conn.send.call_count == len(conn_response)
+    assert mock_signal._signal_conn.sendall.call_count == len(conn_response)
     assert mock_signal._signal_conn.recv.call_count == len(conn_response)
 
 
 def test_evaluate_broken_signal(mock_signal):
-    mock_signal._signal_conn.recv.side_effect = [ACK, ACK, 'error']
+    mock_signal._signal_conn.recv.side_effect = [ACK, ACK, b'error']
     with mock.patch(
-        'clusterman.signals.external_signal.get_metrics_for_signal', return_value={}
+        'clusterman.signals.external_signal.run_metrics_queries', return_value={}
     ), pytest.raises(ClustermanSignalError):
         mock_signal.evaluate(arrow.get(12345678))
 
 
 def test_evaluate_restart_dead_signal(mock_signal):
-    mock_signal._signal_conn.recv.side_effect = [BrokenPipeError, ACK, ACK, '{"Resources": {"cpus": 1}}']
+    mock_signal._signal_conn.recv.side_effect = [BrokenPipeError, ACK, ACK, b'{"Resources": {"cpus": 1}}']
     with mock.patch(
         'clusterman.signals.external_signal.ExternalSignal._connect_to_signal_process'
     ) as mock_connect, mock.patch(
-        'clusterman.signals.external_signal.get_metrics_for_signal', return_value={}
+        'clusterman.signals.external_signal.run_metrics_queries', return_value={}
     ):
         mock_connect.return_value = mock_signal._signal_conn
         assert mock_signal.evaluate(arrow.get(12345678)) == SignalResourceRequest(cpus=1)
         assert mock_connect.call_count == 1
 
 
-@pytest.mark.parametrize('error', [BrokenPipeError, 'error'])
+@pytest.mark.parametrize('error', [BrokenPipeError, b'error'])
 def test_evaluate_restart_dead_signal_fails(mock_signal, error):
     mock_signal._get_metrics = mock.Mock(return_value={})
     mock_signal._signal_conn.recv.side_effect = [BrokenPipeError, ACK, ACK, error]
     with mock.patch(
         'clusterman.signals.external_signal.ExternalSignal._connect_to_signal_process'
     ) as mock_connect, mock.patch(
-        'clusterman.signals.external_signal.get_metrics_for_signal', return_value={}
+        'clusterman.signals.external_signal.run_metrics_queries', return_value={}
     ), pytest.raises(ClustermanSignalError):
         mock_connect.return_value = mock_signal._signal_conn
         mock_signal.evaluate(arrow.get(12345678))
@@ -104,19 +132,42 @@ def test_evaluate_restart_dead_signal_fails(mock_signal, error):
 ])
 def test_evaluate_signal_sending_message(mock_signal, signal_recv):
     metrics = {'cpus_allocated': [(1234, 3.5), (1235, 6)]}
-    num_messages = math.ceil(len(json.dumps({'metrics': metrics, 'timestamp': 12345678})) / 2) + 1
+    metric_bytes = orjson.dumps({'metrics': metrics, 'timestamp': 12345678})
     mock_signal._signal_conn = mock.Mock()
     mock_signal._signal_conn.recv.side_effect = signal_recv
     with mock.patch(
-        'clusterman.signals.external_signal.get_metrics_for_signal',
+        'clusterman.signals.external_signal.run_metrics_queries',
         return_value=metrics,
     ):
         resp = mock_signal.evaluate(arrow.get(12345678))
-    assert mock_signal._signal_conn.send.call_count == num_messages
+    assert mock_signal._signal_conn.sendall.call_args_list == [
+        mock.call(struct.pack('>I', len(metric_bytes))),
+        mock.call(metric_bytes),
+    ]
     assert mock_signal._signal_conn.recv.call_count == len(signal_recv)
     assert resp == SignalResourceRequest(cpus=5.2)
 
 
+def test_evaluate_signal_logs_response(mock_signal):
+    mock_signal._signal_conn.recv.side_effect = [ACK, ACK, b'{"Resources": {"cpus": 5.2}}']
+    with mock.patch(
+        'clusterman.signals.external_signal.run_metrics_queries', return_value={},
+    ), mock.patch('clusterman.signals.external_signal.logger') as mock_logger:
+        mock_signal.evaluate(arrow.get(12345678))
+    assert mock_logger.info.call_args == mock.call(b'{"Resources": {"cpus": 5.2}}')
+
+
+def test_evaluate_signal_decimal_metrics(mock_signal):
+    metrics = {'cpus_allocated': [(Decimal('1234'), Decimal('3.5')), (Decimal('1235.0'), Decimal('6'))]}
+    mock_signal._signal_conn.recv.side_effect = [ACK, ACK, b'{"Resources": {"cpus": 5.2}}']
+    with mock.patch('clusterman.signals.external_signal.run_metrics_queries', return_value=metrics):
+        mock_signal.evaluate(arrow.get(12345678))
+    # check the exact bytes, since integral values have to go to the signal as ints, not floats
+    assert mock_signal._signal_conn.sendall.call_args[0][0] == (
+        b'{"metrics":{"cpus_allocated":[[1234,3.5],[1235,6]]},"timestamp":12345678}'
+    )
+
+
 def test_setup_signals_namespace():
     fetch_num, signal_num = setup_signals_environment('bar', 'mesos')
     assert sorted(os.environ['CMAN_VERSIONS_TO_FETCH'].split(' ')) == ['master', 'v42']
@@ -49,5 +49,11 @@ def test_read_new_object(raw_ts, mock_ts_1, mock_open):
             ]
         }
     }
-    mock_open.read.return_value = jsonpickle.encode(expected_return).encode()
+    mock_open.read.return_value = jsonpickle.encode(expected_return)
     assert read_object_from_compressed_json('foo', raw_timestamps=raw_ts) == expected_return
+
+
+def test_read_write_round_trip(mock_ts_1, tmpdir):
+    filename = str(tmpdir.join('foo.json.gz'))
+    write_object_to_compressed_json(mock_ts_1, filename)
+    assert read_object_from_compressed_json(filename) == mock_ts_1
@@ -154,6 +154,8 @@ def test_terminate_instance(spot_fleet, test_instances_by_market):
     assert len(remain_instances) == split_point
     for instance in added_instances[:split_point]:
         assert instance.id in remain_instances
+    assert spot_fleet.market_capacities == {MARKETS[0]: 1, MARKETS[1]: 2}
+    assert spot_fleet.fulfilled_capacity == 3
 
 
 @pytest.mark.parametrize('dry_run', [True, False])
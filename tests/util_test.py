@@ -24,6 +24,7 @@ from clusterman.util import any_of
 from clusterman.util import ask_for_choice
 from clusterman.util import ask_for_confirmation
 from clusterman.util import autoscaling_is_paused
+from clusterman.util import ClustermanResources
 from clusterman.util import color_conditions
 from clusterman.util import get_cluster_name_list
 from clusterman.util import get_pool_name_list
@@ -32,6 +33,7 @@ from clusterman.util import parse_time_string
 from clusterman.util import sensu_checkin
 from clusterman.util import splay_event_time
 from clusterman.util import Status
+from clusterman.util import sum_resources
 
 
 @pytest.fixture(autouse=True)
@@ -192,14 +194,22 @@ def test_get_cluster_name_list():
 
 
 @mock.patch('clusterman.util.get_cluster_config_directory')
-@mock.patch('os.listdir')
-def test_get_pool_name_list(mock_listdir, mock_get_cluster_config_directory):
-    mock_get_cluster_config_directory.return_value = '/tmp/somedir/cluster-A'
-    mock_listdir.return_value = ['pool-A.mesos', 'pool-B.xml', 'pool-C.mesos', 'pool-D', 'pool-F.kubernetes']
+def test_get_pool_name_list(mock_get_cluster_config_directory, tmpdir):
+    get_pool_name_list.cache_clear()
+    mock_get_cluster_config_directory.return_value = str(tmpdir)
+    for filename in ['pool-A.mesos', 'pool-B.xml', 'pool-C.mesos', 'pool-D', 'pool-F.kubernetes', '.pool-G.mesos']:
+        tmpdir.join(filename).write('')
+    tmpdir.mkdir('pool-H.mesos')
     assert set(get_pool_name_list('cluster-A', 'mesos')) == {'pool-A', 'pool-C'}
     assert set(get_pool_name_list('cluster-A', 'kubernetes')) == {'pool-F'}
     assert mock_get_cluster_config_directory.call_args == mock.call('cluster-A')
-    assert mock_listdir.call_args == mock.call('/tmp/somedir/cluster-A')
+
+    # the pool list is cached, so new files don't show up until the cache expires
+    tmpdir.join('pool-I.mesos').write('')
+    assert set(get_pool_name_list('cluster-A', 'mesos')) == {'pool-A', 'pool-C'}
+    # every caller shares the cached result, so it can't be a mutable list
+    assert isinstance(get_pool_name_list('cluster-A', 'mesos'), tuple)
+    get_pool_name_list.cache_clear()
 
 
 def test_is_paused_no_data_for_cluster():
@@ -232,3 +242,11 @@ def test_splay_event_time(mock_hash):
     mock_hash.return_value = frequency - 1  # make `hash(key) % frequency` returns its max value
     for timestamp in range(20):
         assert 0 <= splay_event_time(frequency, 'key', timestamp) < frequency
+
+
+def test_sum_resources():
+    assert sum_resources([]) == ClustermanResources()
+    assert sum_resources([
+        ClustermanResources(cpus=1, mem=2, disk=3, gpus=4),
+        ClustermanResources(cpus=5, mem=6, disk=7),
+    ]) == ClustermanResources(cpus=6, mem=8, disk=10, gpus=4)